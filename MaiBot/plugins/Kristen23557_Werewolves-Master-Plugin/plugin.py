@@ -1,18 +1,36 @@
 import os
-import json
 import time
 import random
 import asyncio
 import datetime
 import hashlib
-from typing import List, Tuple, Type, Dict, Any, Optional, Set
+import threading
+from typing import List, Tuple, Type, Dict, Any, Optional, Set, Final
 from enum import Enum
+
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        # saved_players 等集合字段以列表形式写出
+        return orjson.dumps(obj, default=list, option=orjson.OPT_INDENT_2)
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=list).encode("utf-8")
+
+    _json_loads = json.loads
 from src.plugin_system import (
     BasePlugin,
     register_plugin,
     BaseCommand,
+    BaseEventHandler,
     ComponentInfo,
-    ConfigField
+    ConfigField,
+    EventType
 )
 from src.plugin_system.apis import send_api, chat_api
 from src.plugin_system.apis import person_api
@@ -185,6 +203,21 @@ ROLES = {
     }
 }
 
+# 游戏改动合并落盘的延迟(秒)
+_FLUSH_DELAY: Final[float] = 2.0
+
+# 角色 -> 夜晚行动键
+_ROLE_ACTION_KEYS: Final[Dict[str, str]] = {
+    "seer": "seer",
+    "witch": "witch_poison",  # 女巫毒药行动键
+    "wolf": "wolf_kill",
+    "guard": "guard",
+    "magician": "magician",
+    "spiritualist": "spiritualist",
+    "cupid": "cupid",
+    "painter": "painter"
+}
+
 # ==================== 消息发送工具类 ====================
 class MessageSender:
     """消息发送工具类，封装正确的API调用方式"""
@@ -255,6 +288,9 @@ class WerewolfGameManager:
             cls._instance.games = {}
             cls._instance.player_profiles = {}
             cls._instance.last_activity = {}
+            cls._instance.dirty = set()  # 待落盘的房间，由 mark_dirty 安排的延迟任务批量保存
+            cls._instance._flush_task = None
+            cls._instance._file_lock = threading.Lock()  # 串行化游戏文件的写入与删除、归档
             cls._instance._load_profiles()
         return cls._instance
     
@@ -267,8 +303,8 @@ class WerewolfGameManager:
             if filename.endswith('.json'):
                 file_path = os.path.join(profiles_dir, filename)
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        profile = json.load(f)
+                    with open(file_path, 'rb') as f:
+                        profile = _json_loads(f.read())
                         qq = filename[:-5]  # 去掉.json后缀
                         self.player_profiles[qq] = profile
                 except Exception as e:
@@ -283,8 +319,8 @@ class WerewolfGameManager:
         os.makedirs(profiles_dir, exist_ok=True)
         
         file_path = os.path.join(profiles_dir, f"{qq}.json")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.player_profiles[qq], f, ensure_ascii=False, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(_json_dumps(self.player_profiles[qq]))
     
     def get_or_create_profile(self, qq: str, name: str) -> Dict[str, Any]:
         """获取或创建玩家档案"""
@@ -378,7 +414,7 @@ class WerewolfGameManager:
         
         self.games[room_id] = game
         self.last_activity[room_id] = time.time()
-        self._save_game_file(room_id)
+        self.mark_dirty(room_id)
         return game
     
     def join_game(self, room_id: str, player_qq: str, player_name: str) -> bool:
@@ -413,7 +449,7 @@ class WerewolfGameManager:
         game["player_order"].append(player_qq)
         
         self.last_activity[room_id] = time.time()
-        self._save_game_file(room_id)
+        self.mark_dirty(room_id)
         return True
     
     def destroy_game(self, room_id: str) -> bool:
@@ -421,17 +457,17 @@ class WerewolfGameManager:
         if room_id not in self.games:
             return False
         
-        # 删除游戏文件
+        # 删除游戏文件并从内存中移除，与后台写入互斥，避免写入中的快照重新生成文件
         games_dir = os.path.join(os.path.dirname(__file__), "games")
         file_path = os.path.join(games_dir, f"{room_id}.json")
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                print(f"删除游戏文件失败: {e}")
-        
-        # 从内存中移除
-        del self.games[room_id]
+        with self._file_lock:
+            if os.path.exists(file_path):
+                try:
+                    os.remove(file_path)
+                except Exception as e:
+                    print(f"删除游戏文件失败: {e}")
+            del self.games[room_id]
+        self.dirty.discard(room_id)
         if room_id in self.last_activity:
             del self.last_activity[room_id]
         
@@ -465,24 +501,68 @@ class WerewolfGameManager:
         game["started_time"] = datetime.datetime.now().isoformat()
         game["phase_start_time"] = time.time()
         self.last_activity[room_id] = time.time()
-        self._save_game_file(room_id)
+        self.mark_dirty(room_id)
         return True
     
+    def _dump_game(self, room_id: str) -> Optional[Tuple[str, Dict[str, Any], bytes]]:
+        """序列化游戏数据，返回 (房间号, 游戏对象, 内容)"""
+        game = self.games.get(room_id)
+        if game is None:
+            return None
+        try:
+            return room_id, game, _json_dumps(game)
+        except Exception as e:
+            print(f"保存游戏文件失败: {e}")
+            return None
+    
+    def _write_game_file(self, room_id: str, game: Dict[str, Any], data: bytes):
+        """写出游戏文件，房间在写入前已被销毁、归档或重建时丢弃该快照"""
+        games_dir = os.path.join(os.path.dirname(__file__), "games")
+        file_path = os.path.join(games_dir, f"{room_id}.json")
+        with self._file_lock:
+            if self.games.get(room_id) is not game:
+                return
+            try:
+                os.makedirs(games_dir, exist_ok=True)
+                with open(file_path, 'wb') as f:
+                    f.write(data)
+            except Exception as e:
+                print(f"保存游戏文件失败: {e}")
+    
     def _save_game_file(self, room_id: str):
         """保存游戏文件"""
-        if room_id not in self.games:
+        dumped = self._dump_game(room_id)
+        if dumped:
+            self._write_game_file(*dumped)
+    
+    def mark_dirty(self, room_id: str):
+        """标记房间有改动，首次标记时安排一次延迟批量落盘"""
+        self.dirty.add(room_id)
+        if self._flush_task is not None and not self._flush_task.done():
             return
-        
-        game = self.games[room_id]
-        games_dir = os.path.join(os.path.dirname(__file__), "games")
-        os.makedirs(games_dir, exist_ok=True)
-        
-        file_path = os.path.join(games_dir, f"{room_id}.json")
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(game, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"保存游戏文件失败: {e}")
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 没有运行中的事件循环时直接同步保存
+            self.dirty.discard(room_id)
+            self._save_game_file(room_id)
+            return
+        self._flush_task = loop.create_task(self._delayed_flush())
+    
+    async def _delayed_flush(self):
+        """等待一小段时间合并改动后落盘，期间新增的改动在下一轮保存"""
+        while self.dirty:
+            await asyncio.sleep(_FLUSH_DELAY)
+            await self.flush_dirty_games()
+    
+    async def flush_dirty_games(self):
+        """批量保存有改动的游戏文件"""
+        if not self.dirty:
+            return
+        dirty, self.dirty = self.dirty, set()
+        # 在事件循环内序列化快照，线程中只负责写字节
+        snapshots = [d for d in map(self._dump_game, dirty) if d]
+        await asyncio.gather(*[asyncio.to_thread(self._write_game_file, *d) for d in snapshots])
     
     def archive_game(self, room_id: str):
         """归档游戏"""
@@ -552,6 +632,10 @@ class WerewolfGameManager:
                 
                 self._save_profile(player_qq)
         
+        # 归档前先落盘未保存的改动
+        self.dirty.discard(room_id)
+        self._save_game_file(room_id)
+        
         # 移动文件到finished文件夹
         games_dir = os.path.join(os.path.dirname(__file__), "games")
         finished_dir = os.path.join(games_dir, "finished")
@@ -560,14 +644,14 @@ class WerewolfGameManager:
         source_file = os.path.join(games_dir, f"{room_id}.json")
         target_file = os.path.join(finished_dir, f"{game_code}.json")
         
-        try:
-            if os.path.exists(source_file):
-                os.rename(source_file, target_file)
-        except Exception as e:
-            print(f"移动游戏文件失败: {e}")
-        
-        # 从内存中移除
-        del self.games[room_id]
+        # 移动文件并从内存中移除，与后台写入互斥
+        with self._file_lock:
+            try:
+                if os.path.exists(source_file):
+                    os.rename(source_file, target_file)
+            except Exception as e:
+                print(f"移动游戏文件失败: {e}")
+            del self.games[room_id]
         if room_id in self.last_activity:
             del self.last_activity[room_id]
         
@@ -580,8 +664,8 @@ class WerewolfGameManager:
         
         if os.path.exists(file_path):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(file_path, 'rb') as f:
+                    return _json_loads(f.read())
             except Exception as e:
                 print(f"读取归档游戏 {game_code} 失败: {e}")
         return None
@@ -642,7 +726,7 @@ class GameLogicProcessor:
                 game["phase"] = GamePhase.WITCH_SAVE_PHASE.value
                 game["phase_start_time"] = time.time()
                 self.game_manager.last_activity[room_id] = time.time()
-                self.game_manager._save_game_file(room_id)
+                self.game_manager.mark_dirty(room_id)
                 
                 # 通知女巫
                 candidates_text = "\n".join([f"{num}号 - {name}" for num, name in potential_deaths])
@@ -807,7 +891,7 @@ class GameLogicProcessor:
         game["saved_players"] = set()  # 清空拯救记录
         
         self.game_manager.last_activity[room_id] = time.time()
-        self.game_manager._save_game_file(room_id)
+        self.game_manager.mark_dirty(room_id)
         
         # 发送白天开始消息
         await self._send_day_start_message(game, room_id)
@@ -1134,7 +1218,7 @@ class GameLogicProcessor:
                 game["phase"] = GamePhase.HUNTER_REVENGE.value
                 game["phase_start_time"] = time.time()
                 self.game_manager.last_activity[room_id] = time.time()
-                self.game_manager._save_game_file(room_id)
+                self.game_manager.mark_dirty(room_id)
                 
                 await self._send_private_message(game, player["qq"],
                                                "💥 复仇时间！你可以选择开枪带走一名玩家。使用命令: /wwg shoot <玩家号码>")
@@ -1150,7 +1234,7 @@ class GameLogicProcessor:
         game["witch_used_save_this_night"] = False
         game["witch_used_poison_this_night"] = False
         self.game_manager.last_activity[room_id] = time.time()
-        self.game_manager._save_game_file(room_id)
+        self.game_manager.mark_dirty(room_id)
         
         await self._send_night_start_message(game, room_id)
         return True
@@ -1237,17 +1321,7 @@ class GameLogicProcessor:
     
     def _get_role_action_key(self, role: str) -> str:
         """获取角色行动键"""
-        action_keys = {
-            "seer": "seer",
-            "witch": "witch_poison",  # 女巫毒药行动键
-            "wolf": "wolf_kill",
-            "guard": "guard",
-            "magician": "magician",
-            "spiritualist": "spiritualist",
-            "cupid": "cupid",
-            "painter": "painter"
-        }
-        return action_keys.get(role, "")
+        return _ROLE_ACTION_KEYS.get(role, "")
     
     def _get_phase_timeout(self, phase: str) -> str:
         """获取阶段超时时间描述"""
@@ -1831,7 +1905,7 @@ class WerewolfGameCommand(BaseCommand):
                     return False, "玩家数量超出范围", True
                 
                 game["settings"]["player_count"] = player_count
-                self.game_manager._save_game_file(room_id)
+                self.game_manager.mark_dirty(room_id)
                 
                 await self.send_text(f"✅ 设置玩家数量为: {player_count}")
                 return True, f"设置玩家数量为 {player_count}", True
@@ -1857,7 +1931,7 @@ class WerewolfGameCommand(BaseCommand):
                     return False, "角色数量为负", True
                 
                 game["settings"]["roles"][role_key] = role_count
-                self.game_manager._save_game_file(room_id)
+                self.game_manager.mark_dirty(room_id)
                 
                 role_name = ROLES[role_key]["name"]
                 await self.send_text(f"✅ 设置 {role_name} ({role_key}) 数量为: {role_count}")
@@ -2100,7 +2174,7 @@ class WerewolfGameCommand(BaseCommand):
                     game["night_actions"]["witch_poison"] = args
                     player["has_acted"] = True
                     self.game_manager.last_activity[room_id] = time.time()
-                    self.game_manager._save_game_file(room_id)
+                    self.game_manager.mark_dirty(room_id)
                     
                     # 计算行动进度
                     acted_count = len([p for p in game["players"].values() 
@@ -2158,7 +2232,7 @@ class WerewolfGameCommand(BaseCommand):
                 
                 player["has_acted"] = True
                 self.game_manager.last_activity[room_id] = time.time()
-                self.game_manager._save_game_file(room_id)
+                self.game_manager.mark_dirty(room_id)
                 
                 # 计算行动进度
                 acted_count = len([p for p in game["players"].values() 
@@ -2198,7 +2272,7 @@ class WerewolfGameCommand(BaseCommand):
             
             game["night_actions"]["witch_save"] = args
             self.game_manager.last_activity[room_id] = time.time()
-            self.game_manager._save_game_file(room_id)
+            self.game_manager.mark_dirty(room_id)
             
             # 处理女巫解药阶段
             await self.game_processor.process_witch_save_phase(room_id)
@@ -2216,7 +2290,7 @@ class WerewolfGameCommand(BaseCommand):
         
         game["night_actions"]["witch_skip"] = "true"
         self.game_manager.last_activity[room_id] = time.time()
-        self.game_manager._save_game_file(room_id)
+        self.game_manager.mark_dirty(room_id)
         
         # 处理女巫解药阶段
         await self.game_processor.process_witch_save_phase(room_id)
@@ -2255,7 +2329,7 @@ class WerewolfGameCommand(BaseCommand):
             await self.send_text(f"📊 投票进度: {voted_players}/{total_alive} 位存活玩家已完成投票")
             
             self.game_manager.last_activity[room_id] = time.time()
-            self.game_manager._save_game_file(room_id)
+            self.game_manager.mark_dirty(room_id)
             
             # 检查是否所有玩家都已完成投票
             await self.game_processor.process_vote(room_id)
@@ -2304,7 +2378,7 @@ class WerewolfGameCommand(BaseCommand):
             game["votes"] = {}
             game["night_actions"] = {}
             self.game_manager.last_activity[room_id] = time.time()
-            self.game_manager._save_game_file(room_id)
+            self.game_manager.mark_dirty(room_id)
             
             await self._send_night_start_message(game, room_id)
             return True, "白狼王自爆", True
@@ -2346,7 +2420,7 @@ class WerewolfGameCommand(BaseCommand):
             game["votes"] = {}
             game["night_actions"] = {}
             self.game_manager.last_activity[room_id] = time.time()
-            self.game_manager._save_game_file(room_id)
+            self.game_manager.mark_dirty(room_id)
             
             await self._send_night_start_message(game, room_id)
             return True, "猎人开枪", True
@@ -2371,17 +2445,7 @@ class WerewolfGameCommand(BaseCommand):
     
     def _get_role_action_key(self, role: str) -> str:
         """获取角色行动键"""
-        action_keys = {
-            "seer": "seer",
-            "witch": "witch_poison",
-            "wolf": "wolf_kill",
-            "guard": "guard",
-            "magician": "magician",
-            "spiritualist": "spiritualist",
-            "cupid": "cupid",
-            "painter": "painter"
-        }
-        return action_keys.get(role, "")
+        return _ROLE_ACTION_KEYS.get(role, "")
     
     async def _send_private_message(self, game: Dict[str, Any], qq: str, message: str):
         """发送私聊消息 - 使用正确的API"""
@@ -2396,6 +2460,18 @@ class WerewolfGameCommand(BaseCommand):
         message = f"🌙 第 {game['day_count']} 夜开始！请有夜晚行动能力的玩家使用相应命令行动。"
         await self._send_group_message(game, message)
 
+# ==================== 停止事件处理器 ====================
+class WerewolfStopHandler(BaseEventHandler):
+    """麦麦关闭时保存尚未落盘的游戏"""
+    
+    event_type = EventType.ON_STOP
+    handler_name = "werewolf_stop_handler"
+    handler_description = "关闭时保存狼人杀游戏数据"
+    
+    async def execute(self, message):
+        await WerewolfGameManager().flush_dirty_games()
+        return True, True, None, None, None
+
 # ==================== 主插件类 ====================
 @register_plugin
 class WerewolfGamePlugin(BasePlugin):
@@ -2457,5 +2533,6 @@ class WerewolfGamePlugin(BasePlugin):
         """返回插件组件"""
         return [
             (WerewolfGameCommand.get_command_info(), WerewolfGameCommand),
-            (TestPrivateMessageCommand.get_command_info(), TestPrivateMessageCommand)
+            (TestPrivateMessageCommand.get_command_info(), TestPrivateMessageCommand),
+            (WerewolfStopHandler.get_handler_info(), WerewolfStopHandler)
         ]
\ No newline at end of file
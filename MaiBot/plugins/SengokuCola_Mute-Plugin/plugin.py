@@ -16,7 +16,9 @@
 - 禁言命令Command - 手动执行禁言操作（支持用户权限控制）
 """
 
-from typing import List, Tuple, Type, Optional
+from functools import cached_property
+from typing import Dict, List, Tuple, Type, Optional
+import logging
 import random
 
 # 导入新插件系统
@@ -34,6 +36,68 @@ from src.plugin_system.apis import person_api, generator_api
 
 logger = get_logger("mute_plugin")
 
+# 配置中的模板列表 -> 元组快照，按列表对象身份缓存，配置重载后自动重建
+_template_cache: Dict[int, Tuple[list, Tuple[str, ...]]] = {}
+
+
+def _get_templates(templates: list) -> Tuple[str, ...]:
+    """获取模板列表的元组快照"""
+    cached = _template_cache.get(id(templates))
+    if cached is None or cached[0] is not templates:
+        _template_cache.clear()
+        cached = _template_cache[id(templates)] = (templates, tuple(templates))
+    return cached[1]
+
+
+def _check_admin(admin_users: list, user_id: str, platform: str) -> Tuple[bool, Optional[str]]:
+    """检查目标用户是否为管理员
+
+    Args:
+        admin_users: 管理员用户列表，格式：['platform:user_id']
+        user_id: 用户ID
+        platform: 平台
+
+    Returns:
+        Tuple[bool, Optional[str]]: (是否为管理员, 错误信息)
+    """
+    # 如果配置为空，表示没有设置管理员
+    if not admin_users:
+        return False, None
+
+    # 检查目标用户是否在管理员列表中
+    current_user_key = f"{platform}:{user_id}"
+    if current_user_key in admin_users:
+        return True, f"用户 {current_user_key} 是管理员，无法被禁言"
+
+    return False, None
+
+
+def _format_duration(seconds: int) -> str:
+    """将秒数格式化为可读的时间字符串"""
+    if seconds < 60:
+        return f"{seconds}秒"
+    elif seconds < 3600:
+        minutes = seconds // 60
+        remaining_seconds = seconds % 60
+        if remaining_seconds > 0:
+            return f"{minutes}分{remaining_seconds}秒"
+        else:
+            return f"{minutes}分钟"
+    elif seconds < 86400:
+        hours = seconds // 3600
+        remaining_minutes = (seconds % 3600) // 60
+        if remaining_minutes > 0:
+            return f"{hours}小时{remaining_minutes}分钟"
+        else:
+            return f"{hours}小时"
+    else:
+        days = seconds // 86400
+        remaining_hours = (seconds % 86400) // 3600
+        if remaining_hours > 0:
+            return f"{days}天{remaining_hours}小时"
+        else:
+            return f"{days}天"
+
 
 # ===== Action组件 =====
 
@@ -65,31 +129,10 @@ class MuteAction(BaseAction):
     # 关联类型
     associated_types = ["text", "command"]
 
-    def _check_admin_permission(self, user_id: str, platform: str) -> Tuple[bool, Optional[str]]:
-        """检查目标用户是否为管理员
-
-        Args:
-            user_id: 用户ID
-            platform: 平台
-
-        Returns:
-            Tuple[bool, Optional[str]]: (是否为管理员, 错误信息)
-        """
-        # 获取管理员用户配置
-        admin_users = self.get_config("permissions.admin_users", [])
-
-        # 如果配置为空，表示没有设置管理员
-        if not admin_users:
-            return False, None
-
-        # 检查目标用户是否在管理员列表中
-        current_user_key = f"{platform}:{user_id}"
-        for admin_user in admin_users:
-            if admin_user == current_user_key:
-                logger.info(f"{self.log_prefix} 用户 {current_user_key} 是管理员，无法被禁言")
-                return True, f"用户 {current_user_key} 是管理员，无法被禁言"
-
-        return False, None
+    @cached_property
+    def current_group_key(self) -> str:
+        """当前群组的权限键，格式：platform:group_id"""
+        return f"{self.platform}:{self.group_id}"
 
     def _check_group_permission(self) -> Tuple[bool, Optional[str]]:
         """检查当前群是否有禁言动作权限
@@ -106,22 +149,24 @@ class MuteAction(BaseAction):
 
         # 如果配置为空，表示不启用权限控制
         if not allowed_groups:
-            logger.info(f"{self.log_prefix} 群组权限未配置，允许所有群使用禁言动作")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"{self.log_prefix} 群组权限未配置，允许所有群使用禁言动作")
             return True, None
 
         # 检查当前群是否在允许列表中
-        current_group_key = f"{self.platform}:{self.group_id}"
-        for allowed_group in allowed_groups:
-            if allowed_group == current_group_key:
+        current_group_key = self.current_group_key
+        if current_group_key in allowed_groups:
+            if logger.isEnabledFor(logging.INFO):
                 logger.info(f"{self.log_prefix} 群组 {current_group_key} 有禁言动作权限")
-                return True, None
+            return True, None
 
         logger.warning(f"{self.log_prefix} 群组 {current_group_key} 没有禁言动作权限")
         return False, "当前群组没有使用禁言动作的权限"
 
     async def execute(self) -> Tuple[bool, Optional[str]]:
         """执行智能禁言判定"""
-        logger.info(f"{self.log_prefix} 执行智能禁言动作")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"{self.log_prefix} 执行智能禁言动作")
 
         # 首先检查群组权限
         has_permission, permission_error = self._check_group_permission()
@@ -158,12 +203,11 @@ class MuteAction(BaseAction):
                 return False, error_msg
 
             # 限制禁言时长范围
-            if duration_int < min_duration:
-                duration_int = min_duration
-                logger.info(f"{self.log_prefix} 禁言时长过短，调整为{min_duration}秒")
-            elif duration_int > max_duration:
-                duration_int = max_duration
-                logger.info(f"{self.log_prefix} 禁言时长过长，调整为{max_duration}秒")
+            clamped_duration = min(max_duration, max(min_duration, duration_int))
+            if clamped_duration != duration_int and logger.isEnabledFor(logging.INFO):
+                reason = "过长" if clamped_duration < duration_int else "过短"
+                logger.info(f"{self.log_prefix} 禁言时长{reason}，调整为{clamped_duration}秒")
+            duration_int = clamped_duration
 
         except (ValueError, TypeError):
             error_msg = f"禁言时长格式无效: {duration}"
@@ -175,26 +219,25 @@ class MuteAction(BaseAction):
         # person_id = person_api.get_person_id_by_name(target)
         # user_id = await person_api.get_person_value(person_id, "user_id")
         user_id = self.action_message.user_info.user_id
-        person = Person(platform=self.platform, user_id=user_id)
-        person_name = person.person_name
 
-        # 检查是否为管理员
-        is_admin, admin_error = self._check_admin_permission(str(user_id), self.platform)
+        # 拒绝路径只记录动作，用昵称代替 Person 查询，昵称缺失时退回用户ID
+        display_name = self.user_nickname or user_id
+
+        # 检查是否为管理员（先用原始用户ID判断，拒绝路径不解析Person）
+        is_admin, admin_error = _check_admin(
+            self.get_config("permissions.admin_users", []), str(user_id), self.platform
+        )
         if is_admin:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"{self.log_prefix} {admin_error}")
             # 管理员无法被禁言，只记录动作
             await self.store_action_info(
                 action_build_into_prompt=True,
-                action_prompt_display=f"尝试禁言用户 {person_name}，但该用户是管理员，无法禁言",
+                action_prompt_display=f"尝试禁言用户 {display_name}，但该用户是管理员，无法禁言",
                 action_done=False,
             )
             return False, admin_error
 
-        # 格式化时长显示
-        time_str = self._format_duration(duration_int)
-
-        # 获取模板化消息
-        message = self._get_template_message(person_name, time_str, reason)
-
         if not has_permission:
             logger.warning(f"{self.log_prefix} 权限检查失败: {permission_error}")
             result_status, data = await generator_api.rewrite_reply(
@@ -213,13 +256,22 @@ class MuteAction(BaseAction):
 
             await self.store_action_info(
                 action_build_into_prompt=True,
-                action_prompt_display=f"尝试禁言了用户 {person_name}，但是没有权限，无法禁言",
+                action_prompt_display=f"尝试禁言了用户 {display_name}，但是没有权限，无法禁言",
                 action_done=True,
             )
 
             # 不发送错误消息，静默拒绝
             return False, permission_error
 
+        person = Person(platform=self.platform, user_id=user_id)
+        person_name = person.person_name
+
+        # 格式化时长显示
+        time_str = _format_duration(duration_int)
+
+        # 获取模板化消息
+        message = self._get_template_message(person_name, time_str, reason)
+
         result_status, data = await generator_api.rewrite_reply(
             chat_stream=self.chat_stream,
             reply_data={
@@ -239,7 +291,8 @@ class MuteAction(BaseAction):
         )
 
         if success:
-            logger.info(f"{self.log_prefix} 成功发送禁言命令，用户 {person_name}({user_id})，时长 {duration_int} 秒")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"{self.log_prefix} 成功发送禁言命令，用户 {person_name}({user_id})，时长 {duration_int} 秒")
             # 存储动作信息
             await self.store_action_info(
                 action_build_into_prompt=True,
@@ -256,36 +309,11 @@ class MuteAction(BaseAction):
 
     def _get_template_message(self, person_name: str, duration_str: str, reason: str) -> str:
         """获取模板化的禁言消息"""
-        templates = self.get_config("mute.templates")
+        templates = _get_templates(self.get_config("mute.templates"))
 
-        template = random.choice(templates)
+        template = templates[random.randrange(len(templates))]
         return template.format(target=person_name, duration=duration_str, reason=reason)
 
-    def _format_duration(self, seconds: int) -> str:
-        """将秒数格式化为可读的时间字符串"""
-        if seconds < 60:
-            return f"{seconds}秒"
-        elif seconds < 3600:
-            minutes = seconds // 60
-            remaining_seconds = seconds % 60
-            if remaining_seconds > 0:
-                return f"{minutes}分{remaining_seconds}秒"
-            else:
-                return f"{minutes}分钟"
-        elif seconds < 86400:
-            hours = seconds // 3600
-            remaining_minutes = (seconds % 3600) // 60
-            if remaining_minutes > 0:
-                return f"{hours}小时{remaining_minutes}分钟"
-            else:
-                return f"{hours}小时"
-        else:
-            days = seconds // 86400
-            remaining_hours = (seconds % 86400) // 3600
-            if remaining_hours > 0:
-                return f"{days}天{remaining_hours}小时"
-            else:
-                return f"{days}天"
 
 
 # ===== Command组件 =====
@@ -303,31 +331,13 @@ class MuteCommand(BaseCommand):
     command_examples = ["/mute 用户名 300", "/mute 张三 600 刷屏", "/mute @某人 1800 违规内容"]
     intercept_message = True  # 拦截消息处理
 
-    def _check_admin_permission(self, user_id: str, platform: str) -> Tuple[bool, Optional[str]]:
-        """检查目标用户是否为管理员
-
-        Args:
-            user_id: 用户ID
-            platform: 平台
-
-        Returns:
-            Tuple[bool, Optional[str]]: (是否为管理员, 错误信息)
-        """
-        # 获取管理员用户配置
-        admin_users = self.get_config("permissions.admin_users", [])
-
-        # 如果配置为空，表示没有设置管理员
-        if not admin_users:
-            return False, None
-
-        # 检查目标用户是否在管理员列表中
-        current_user_key = f"{platform}:{user_id}"
-        for admin_user in admin_users:
-            if admin_user == current_user_key:
-                logger.info(f"{self.log_prefix} 用户 {current_user_key} 是管理员，无法被禁言")
-                return True, f"用户 {current_user_key} 是管理员，无法被禁言"
-
-        return False, None
+    @cached_property
+    def current_user_key(self) -> Optional[str]:
+        """发起命令用户的权限键，格式：platform:user_id；无法获取聊天流时为None"""
+        chat_stream = self.message.chat_stream
+        if not chat_stream:
+            return None
+        return f"{chat_stream.platform}:{chat_stream.user_info.user_id}"
 
     def _check_user_permission(self) -> Tuple[bool, Optional[str]]:
         """检查当前用户是否有禁言命令权限
@@ -336,27 +346,24 @@ class MuteCommand(BaseCommand):
             Tuple[bool, Optional[str]]: (是否有权限, 错误信息)
         """
         # 获取当前用户信息
-        chat_stream = self.message.chat_stream
-        if not chat_stream:
+        current_user_key = self.current_user_key
+        if current_user_key is None:
             return False, "无法获取聊天流信息"
 
-        current_platform = chat_stream.platform
-        current_user_id = str(chat_stream.user_info.user_id)
-
         # 获取权限配置
         allowed_users = self.get_config("permissions.allowed_users", [])
 
         # 如果配置为空，表示不启用权限控制
         if not allowed_users:
-            logger.info(f"{self.log_prefix} 用户权限未配置，允许所有用户使用禁言命令")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"{self.log_prefix} 用户权限未配置，允许所有用户使用禁言命令")
             return True, None
 
         # 检查当前用户是否在允许列表中
-        current_user_key = f"{current_platform}:{current_user_id}"
-        for allowed_user in allowed_users:
-            if allowed_user == current_user_key:
+        if current_user_key in allowed_users:
+            if logger.isEnabledFor(logging.INFO):
                 logger.info(f"{self.log_prefix} 用户 {current_user_key} 有禁言命令权限")
-                return True, None
+            return True, None
 
         logger.warning(f"{self.log_prefix} 用户 {current_user_key} 没有禁言命令权限")
         return False, "你没有使用禁言命令的权限"
@@ -391,17 +398,18 @@ class MuteCommand(BaseCommand):
                     return False, "时长无效", ""
 
                 # 限制禁言时长范围
-                if duration_int < min_duration:
-                    duration_int = min_duration
-                    await self.send_text(f"⚠️ 禁言时长过短，调整为{min_duration}秒")
-                elif duration_int > max_duration:
-                    duration_int = max_duration
-                    await self.send_text(f"⚠️ 禁言时长过长，调整为{max_duration}秒")
+                clamped_duration = min(max_duration, max(min_duration, duration_int))
 
             except ValueError:
                 await self.send_text("❌ 禁言时长必须是数字")
                 return False, "时长格式错误", ""
 
+            if clamped_duration < duration_int:
+                await self.send_text(f"⚠️ 禁言时长过长，调整为{max_duration}秒")
+            elif clamped_duration > duration_int:
+                await self.send_text(f"⚠️ 禁言时长过短，调整为{min_duration}秒")
+            duration_int = clamped_duration
+
             # 获取用户ID
             person_id = person_api.get_person_id_by_name(target)
             user_id = await person_api.get_person_value(person_id, "user_id")
@@ -412,16 +420,19 @@ class MuteCommand(BaseCommand):
                 return False, error_msg, ""
 
             # 检查是否为管理员
-            is_admin, admin_error = self._check_admin_permission(user_id, self.message.chat_stream.platform)
+            is_admin, admin_error = _check_admin(
+                self.get_config("permissions.admin_users", []), user_id, self.message.chat_stream.platform
+            )
             if is_admin:
                 await self.send_text(f"❌ {admin_error}")
                 logger.warning(f"{self.log_prefix} 尝试禁言管理员 {target}({user_id})，已被拒绝")
                 return False, admin_error, ""
 
             # 格式化时长显示
-            time_str = self._format_duration(duration_int)
+            time_str = _format_duration(duration_int)
 
-            logger.info(f"{self.log_prefix} 执行禁言命令: {target}({user_id}) -> {time_str}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"{self.log_prefix} 执行禁言命令: {target}({user_id}) -> {time_str}")
 
             # 发送群聊禁言命令
             success = await self.send_command(
@@ -435,7 +446,8 @@ class MuteCommand(BaseCommand):
                 message = self._get_template_message(target, time_str, reason)
                 await self.send_text(message)
 
-                logger.info(f"{self.log_prefix} 成功禁言 {target}({user_id})，时长 {duration_int} 秒")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"{self.log_prefix} 成功禁言 {target}({user_id})，时长 {duration_int} 秒")
                 return True, f"成功禁言 {target}，时长 {time_str}", ""
             else:
                 await self.send_text("❌ 发送禁言命令失败")
@@ -448,36 +460,11 @@ class MuteCommand(BaseCommand):
 
     def _get_template_message(self, target: str, duration_str: str, reason: str) -> str:
         """获取模板化的禁言消息"""
-        templates = self.get_config("mute.templates")
+        templates = _get_templates(self.get_config("mute.templates"))
 
-        template = random.choice(templates)
+        template = templates[random.randrange(len(templates))]
         return template.format(target=target, duration=duration_str, reason=reason)
 
-    def _format_duration(self, seconds: int) -> str:
-        """将秒数格式化为可读的时间字符串"""
-        if seconds < 60:
-            return f"{seconds}秒"
-        elif seconds < 3600:
-            minutes = seconds // 60
-            remaining_seconds = seconds % 60
-            if remaining_seconds > 0:
-                return f"{minutes}分{remaining_seconds}秒"
-            else:
-                return f"{minutes}分钟"
-        elif seconds < 86400:
-            hours = seconds // 3600
-            remaining_minutes = (seconds % 3600) // 60
-            if remaining_minutes > 0:
-                return f"{hours}小时{remaining_minutes}分钟"
-            else:
-                return f"{hours}小时"
-        else:
-            days = seconds // 86400
-            remaining_hours = (seconds % 86400) // 3600
-            if remaining_hours > 0:
-                return f"{days}天{remaining_hours}小时"
-            else:
-                return f"{days}天"
 
 
 # ===== 插件主类 =====
@@ -0,0 +1,100 @@
+import os
+import sys
+import types
+
+# Ensure plugin root on path for importing plugin module
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+# Stub modules required by plugin.py
+def _stub(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules.setdefault(name, module)
+    return sys.modules[name]
+
+
+class _Base:  # pragma: no cover - minimal stub
+    pass
+
+
+def get_logger(name):  # pragma: no cover - simple logger stub
+    class Logger:
+        def debug(self, *args, **kwargs):
+            pass
+
+        def info(self, *args, **kwargs):
+            pass
+
+        def warning(self, *args, **kwargs):
+            pass
+
+        def error(self, *args, **kwargs):
+            pass
+
+    return Logger()
+
+
+_stub("src")
+_stub("src.common")
+_stub("src.common.logger", get_logger=get_logger)
+_stub("src.person_info")
+_stub("src.person_info.person_info", Person=_Base)
+_stub("src.plugin_system")
+_stub("src.plugin_system.apis", person_api=None, generator_api=None)
+_stub("src.plugin_system.apis.plugin_register_api", register_plugin=lambda cls: cls)
+_stub("src.plugin_system.base")
+_stub("src.plugin_system.base.base_plugin", BasePlugin=_Base)
+_stub("src.plugin_system.base.base_action", BaseAction=_Base)
+_stub("src.plugin_system.base.base_command", BaseCommand=_Base)
+_stub(
+    "src.plugin_system.base.component_types",
+    ComponentInfo=_Base,
+    ActionActivationType=types.SimpleNamespace(LLM_JUDGE="llm_judge", KEYWORD="keyword", ALWAYS="always"),
+    ChatMode=types.SimpleNamespace(FOCUS="focus", NORMAL="normal", ALL="all"),
+)
+_stub("src.plugin_system.base.config_types", ConfigField=lambda **kwargs: kwargs)
+
+import plugin  # noqa: E402
+from plugin import _get_templates  # noqa: E402
+
+
+def setup_function(function):
+    plugin._template_cache.clear()
+
+
+def test_returns_tuple_snapshot():
+    templates = ["{target} 被禁言 {duration}", "{target} 休息一下吧"]
+    assert _get_templates(templates) == tuple(templates)
+
+
+def test_same_list_is_cached():
+    templates = ["a", "b"]
+    first = _get_templates(templates)
+    assert _get_templates(templates) is first
+
+
+def test_new_list_rebuilds_snapshot():
+    # 配置重载后 get_config 返回新的列表对象，快照应随之更新
+    old = ["a", "b"]
+    _get_templates(old)
+    new = ["c"]
+    assert _get_templates(new) == ("c",)
+    assert len(plugin._template_cache) == 1
+
+
+def test_reused_id_is_not_stale():
+    # 旧列表被回收后新列表可能复用同一个 id，不能返回旧快照
+    old = ["a", "b"]
+    _get_templates(old)
+    new = ["c", "d"]
+    plugin._template_cache[id(new)] = (old, ("a", "b"))
+    assert _get_templates(new) == ("c", "d")
+
+
+def test_equal_but_distinct_list_rebuilds():
+    first = ["a"]
+    snapshot = _get_templates(first)
+    second = ["a"]
+    assert _get_templates(second) == snapshot
+    assert plugin._template_cache[id(second)][0] is second
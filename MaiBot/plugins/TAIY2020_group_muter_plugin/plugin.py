@@ -1,3 +1,4 @@
+import sys
 import time
 import asyncio
 import logging
@@ -21,52 +22,67 @@ logger = get_logger("group_muter_plugin")
 
 # --- 核心状态管理器 ---
 class MuteStatus:
-    _mute_until: Dict[str, float] = {}
-    _group_names: Dict[str, str] = {}
-    _last_summary_log_time: Dict[str, float] = {}
+    # 静音截止时间与摘要日志节流均使用 time.monotonic()，墙上时间仅用于展示
+    _mute_until: Dict[Tuple[str, str], float] = {}
+    _mute_end_wallclock: Dict[Tuple[str, str], float] = {}
+    _group_names: Dict[Tuple[str, str], str] = {}
+    _last_summary_log_time: Dict[Tuple[str, str], float] = {}
 
     @classmethod
-    def _key(cls, platform: str, group_id: str) -> str:
-        return f"{platform}:{group_id}"
+    def _key(cls, platform: str, group_id: str) -> Tuple[str, str]:
+        return (platform, group_id)
 
     @classmethod
-    def set_mute(cls, platform: str, group_id: str, seconds: int, group_name: Optional[str]):
+    def _display_name(cls, key: Tuple[str, str]) -> str:
+        return cls._group_names.get(key) or ":".join(key)
+
+    @classmethod
+    def set_mute(
+        cls, platform: str, group_id: str, seconds: int, group_name: Optional[str], now: Optional[float] = None
+    ):
         key = cls._key(platform, group_id)
-        cls._mute_until[key] = time.time() + seconds
+        cls._mute_until[key] = (time.monotonic() if now is None else now) + seconds
+        cls._mute_end_wallclock[key] = time.time() + seconds
         if group_name:
             cls._group_names[key] = group_name
             GroupMuterLogFilter.add_group(group_name)
-        logger.info(f"[{group_name or key}] 进入静音模式，持续 {seconds} 秒。")
+        logger.info(f"[{group_name or ':'.join(key)}] 进入静音模式，持续 {seconds} 秒。")
 
     @classmethod
     def clear_mute(cls, platform: str, group_id: str):
         key = cls._key(platform, group_id)
         if cls._mute_until.pop(key, None):
+            cls._mute_end_wallclock.pop(key, None)
             group_name = cls._group_names.pop(key, None)
             if group_name:
                 GroupMuterLogFilter.remove_group(group_name)
-            logger.info(f"[{group_name or key}] 已解除静音模式。")
+            logger.info(f"[{group_name or ':'.join(key)}] 已解除静音模式。")
 
     @classmethod
-    def is_muted(cls, platform: str, group_id: str) -> bool:
+    def is_muted(cls, platform: str, group_id: str, now: Optional[float] = None) -> bool:
+        if not cls._mute_until:
+            return False
         key = cls._key(platform, group_id)
         mute_end_time = cls._mute_until.get(key)
-        if mute_end_time and time.time() >= mute_end_time:
-            logger.info(f"[{cls._group_names.get(key, key)}] 静音时间已到，自动解除。")
+        if mute_end_time and (time.monotonic() if now is None else now) >= mute_end_time:
+            logger.info(f"[{cls._display_name(key)}] 静音时间已到，自动解除。")
             cls.clear_mute(platform, group_id)
             return False
         return bool(mute_end_time)
 
     @classmethod
-    def log_summary(cls, platform: str, group_id: str):
+    def log_summary(cls, platform: str, group_id: str, now: Optional[float] = None):
+        if not cls._mute_until:
+            return
         key = cls._key(platform, group_id)
-        now = time.time()
-        if now - cls._last_summary_log_time.get(key, 0) < 30:
+        if now is None:
+            now = time.monotonic()
+        if now - cls._last_summary_log_time.get(key, float("-inf")) < 30:
             return
         if mute_end_time := cls._mute_until.get(key):
             remaining = int(mute_end_time - now)
-            end_str = time.strftime("%H:%M:%S", time.localtime(mute_end_time))
-            display_name = cls._group_names.get(key, key)
+            end_str = time.strftime("%H:%M:%S", time.localtime(cls._mute_end_wallclock.get(key, time.time())))
+            display_name = cls._display_name(key)
             logger.info(
                 f"[{display_name}] 处于静音模式，剩余 {remaining} 秒，将在 {end_str} 结束。")
             cls._last_summary_log_time[key] = now
@@ -79,33 +95,40 @@ class MuteEventInterceptor(BaseEventHandler):
     weight = 10000
     intercept_message = True
 
+    # 配置快照，由 GroupMuterPlugin._initialize_plugin_settings 在加载时写入
+    _unmute_re: Optional[re.Pattern] = None  # 未启用解除静音或无关键词时为 None
+    _at_mention_break: bool = True
+
     async def execute(self, message: MaiMessages) -> Tuple[bool, bool, Optional[str], None, None]:
         if not message.is_group_message:
             return True, True, "非群聊消息，放行", None, None
+        if not MuteStatus._mute_until:
+            return True, True, "无静音中的群聊，放行", None, None
 
         info = message.message_base_info
-        platform, group_id = str(info.get("platform", "")), str(
-            info.get("group_id", ""))
-        if not platform or not group_id or not MuteStatus.is_muted(platform, group_id):
+        # 驻留字符串，同一群的后续消息在字典查找时可直接按身份比较
+        platform = sys.intern(str(info.get("platform", "")))
+        group_id = sys.intern(str(info.get("group_id", "")))
+        now = time.monotonic()
+        if not platform or not group_id or not MuteStatus.is_muted(platform, group_id, now):
             return True, True, "非静音群聊，放行", None, None
 
         user_id = str(info.get("user_id", ""))
         is_admin = GroupMuterPlugin.check_permission(
             user_id, self.plugin_config)
         if not is_admin:
-            MuteStatus.log_summary(platform, group_id)
+            MuteStatus.log_summary(platform, group_id, now)
             return True, False, "静音中，非管理员消息已拦截", None, None
 
-        unmute_keywords = self.get_config("mute.unmute_keywords", [])
-        if self.get_config("mute.enable_unmute", True) and _is_keyword_in_text(message.plain_text or "", unmute_keywords):
+        if _is_keyword_in_text(message.plain_text or "", self._unmute_re):
             return True, True, "管理员解除指令，放行给Command处理", None, None
 
-        if self.get_config("mute.at_mention_break", True) and is_bot_mentioned(message):
+        if self._at_mention_break and is_bot_mentioned(message):
             MuteStatus.clear_mute(platform, group_id)
             logger.info(f"管理员({user_id})通过'@提及'操作解除了群({group_id})的静音。")
             return True, True, "管理员@提及，解除静音并放行", None, None
 
-        MuteStatus.log_summary(platform, group_id)
+        MuteStatus.log_summary(platform, group_id, now)
         return True, False, "静音中，管理员普通消息已拦截", None, None
 
 # --- 命令组件 ---
@@ -115,6 +138,7 @@ class MuteCommand(BaseCommand):
     command_name = "mute"
     command_description = "让麦麦进入静音模式"
     command_pattern = ""
+    duration_seconds: int = 1200
 
     async def execute(self) -> Tuple[bool, Optional[str], bool]:
         if not self.message.chat_stream.group_info:
@@ -129,7 +153,7 @@ class MuteCommand(BaseCommand):
         platform = self.message.chat_stream.platform
         group_id = str(self.message.chat_stream.group_info.group_id)
         group_name = self.message.chat_stream.group_info.group_name
-        duration = self.get_config("mute.duration_seconds", 1200)
+        duration = self.duration_seconds
 
         MuteStatus.set_mute(platform, group_id, duration, group_name)
         await self.send_text("好吧，那我去看会书📘，你们先聊...")
@@ -159,31 +183,40 @@ class UnmuteCommand(BaseCommand):
         return True, f"已为群聊 {group_name or group_id} 解除静音模式。", True
 
 # --- 日志过滤器 ---
+_CHAT_LOG_NAMES = frozenset({"chat", "normal_chat", "memory", "events_manager"})
+
+
 class GroupMuterLogFilter(logging.Filter):
     muted_group_names: Set[str] = set()
+    # 所有静音群名合并成的单个正则，无静音群时为 None
+    _combined_re: Optional[re.Pattern] = None
 
     def filter(self, record: logging.LogRecord) -> bool:
-        if "group_muter_plugin" in record.name:
+        # 仅挂载在 _CHAT_LOG_NAMES 对应的 logger 上，无需再判断 record.name
+        combined_re = GroupMuterLogFilter._combined_re
+        if combined_re is None:
             return True
 
-        msg = record.getMessage()
-        is_chat_log = record.name in ("chat", "normal_chat", "memory", "events_manager")
-        if not is_chat_log:
-            return True
+        return combined_re.search(record.getMessage()) is None
 
-        for group_name in self.muted_group_names:
-            if group_name in msg:
-                return False
-        return True
+    @classmethod
+    def _rebuild(cls):
+        if cls.muted_group_names:
+            cls._combined_re = re.compile("|".join(re.escape(name) for name in cls.muted_group_names))
+        else:
+            cls._combined_re = None
 
     @classmethod
     def add_group(cls, group_name: Optional[str]):
-        if group_name:
+        if group_name and group_name not in cls.muted_group_names:
             cls.muted_group_names.add(group_name)
+            cls._rebuild()
 
     @classmethod
     def remove_group(cls, group_name: Optional[str]):
-        cls.muted_group_names.discard(group_name)
+        if group_name in cls.muted_group_names:
+            cls.muted_group_names.discard(group_name)
+            cls._rebuild()
 
 # --- 注册插件 ---
 @register_plugin
@@ -220,6 +253,14 @@ class GroupMuterPlugin(BasePlugin):
         },
     }
 
+    # 麦麦的QQ号、昵称与别名，以及提及检测用的预编译正则，在 _initialize_plugin_settings 中构建
+    _bot_qq: str = ""
+    _bot_names: frozenset = frozenset()
+    _at_qq_re: Optional[re.Pattern] = None
+    _at_name_re: Optional[re.Pattern] = None
+    # (user_control 配置节, 名单原对象, 名单长度, 名单类型, 用户集合)
+    _acl_cache: Optional[Tuple[Dict, list, int, str, frozenset]] = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         try:
@@ -230,32 +271,74 @@ class GroupMuterPlugin(BasePlugin):
             self.enable_plugin = False
 
     def _initialize_plugin_settings(self):
-        root_logger = logging.getLogger()
-        if not any(isinstance(f, GroupMuterLogFilter) for f in root_logger.filters):
-            root_logger.addFilter(GroupMuterLogFilter())
-
-        mute_kws = self.get_config("mute.mute_keywords", [])
-        unmute_kws = self.get_config("mute.unmute_keywords", [])
-
-        mute_pattern = "|".join(re.escape(k) for k in mute_kws if k.strip())
+        for log_name in _CHAT_LOG_NAMES:
+            chat_logger = logging.getLogger(log_name)
+            if not any(isinstance(f, GroupMuterLogFilter) for f in chat_logger.filters):
+                chat_logger.addFilter(GroupMuterLogFilter())
+
+        bot_qq = sys.intern(str(config_api.get_global_config("bot.qq_account")))
+        bot_nickname = config_api.get_global_config("bot.nickname", "")
+        alias_names = config_api.get_global_config("bot.alias_names", [])
+        bot_names = frozenset(sys.intern(name) for name in {bot_nickname, *alias_names} if name)
+        GroupMuterPlugin._bot_qq = bot_qq
+        GroupMuterPlugin._bot_names = bot_names
+        GroupMuterPlugin._at_qq_re = _get_bot_at_re(bot_qq)
+        GroupMuterPlugin._at_name_re = (
+            re.compile(r"@\s*(?:" + "|".join(re.escape(name) for name in bot_names) + ")") if bot_names else None
+        )
+
+        MuteEventInterceptor._at_mention_break = self.get_config("mute.at_mention_break", True)
+        MuteCommand.duration_seconds = self.get_config("mute.duration_seconds", 1200)
+
+        # 命令正则由组件注册表在注册时编译一次；这里只对关键词去重并按长度降序排列，
+        # 让较长的关键词优先参与交替匹配
+        mute_kws = _sorted_keywords(self.get_config("mute.mute_keywords", []))
+        unmute_kws = _sorted_keywords(self.get_config("mute.unmute_keywords", []))
+
+        mute_pattern = "|".join(re.escape(k) for k in mute_kws)
         mention_prefix = r"(?:\[CQ:at,[^\]]+\]\s*|@\S+\s*)*"
 
         MuteCommand.command_pattern = rf"^{mention_prefix}(?:{mute_pattern})\s*$" if mute_kws else "__NEVER_MATCH__"
-        if self.get_config("mute.enable_unmute", True):
-            unmute_pattern = "|".join(re.escape(k) for k in unmute_kws if k.strip())
-            UnmuteCommand.command_pattern = rf"^{mention_prefix}(?:{unmute_pattern})\s*$" if unmute_kws else "__NEVER_MATCH__"
+        if self.get_config("mute.enable_unmute", True) and unmute_kws:
+            unmute_pattern = "|".join(re.escape(k) for k in unmute_kws)
+            UnmuteCommand.command_pattern = rf"^{mention_prefix}(?:{unmute_pattern})\s*$"
+            # 拦截器用与命令相同的形状整串匹配，使放行的消息恰好是解除命令能处理的消息
+            MuteEventInterceptor._unmute_re = re.compile(
+                rf"\s*{mention_prefix}(?:{unmute_pattern})\s*", re.IGNORECASE | re.DOTALL
+            )
         else:
             UnmuteCommand.command_pattern = r"__NEVER_MATCH__"
+            MuteEventInterceptor._unmute_re = None
+
+    @classmethod
+    def _resolve_acl(cls, user_control_config: Dict) -> Tuple[str, frozenset]:
+        """解析权限名单，按配置对象身份缓存，配置重载或名单变更后重建"""
+        list_type = user_control_config.get("list_type", "whitelist")
+        raw_list = user_control_config.get("list", [])
+        cached = cls._acl_cache
+        if (
+            cached is None
+            or cached[0] is not user_control_config
+            or cached[1] is not raw_list
+            or cached[2] != len(raw_list)
+            or cached[3] != list_type
+        ):
+            cached = cls._acl_cache = (
+                user_control_config,
+                raw_list,
+                len(raw_list),
+                list_type,
+                frozenset(str(u) for u in raw_list),
+            )
+        return cached[3], cached[4]
 
-    @staticmethod
-    def check_permission(user_id: str, config: Optional[Dict]) -> bool:
+    @classmethod
+    def check_permission(cls, user_id: str, config: Optional[Dict]) -> bool:
         """ 权限检查函数 """
         if not user_id or not config:
             return False
 
-        user_control_config = config.get("user_control", {})
-        list_type = user_control_config.get("list_type", "whitelist")
-        user_list = {str(u) for u in user_control_config.get("list", [])}
+        list_type, user_list = cls._resolve_acl(config.get("user_control", {}))
         if list_type == "whitelist":
             return user_id in user_list
         if list_type == "blacklist":
@@ -272,11 +355,26 @@ class GroupMuterPlugin(BasePlugin):
         return components
 
 # --- 全局辅助函数 ---
-def _is_keyword_in_text(text: str, keywords: List[str]) -> bool:
-    if not text or not keywords:
+# bot QQ号 -> '@<昵称:QQ号>' 正则，插件重载时同一QQ号直接复用
+_BOT_AT_RE_CACHE: Dict[str, re.Pattern] = {}
+
+
+def _get_bot_at_re(bot_qq: str) -> re.Pattern:
+    pattern = _BOT_AT_RE_CACHE.get(bot_qq)
+    if pattern is None:
+        pattern = _BOT_AT_RE_CACHE[bot_qq] = re.compile(rf"@<[^:]+:{re.escape(bot_qq)}>")
+    return pattern
+
+
+def _sorted_keywords(keywords: List[str]) -> List[str]:
+    """去除空白关键词并去重，按长度降序排列"""
+    return sorted({k for k in keywords if k.strip()}, key=len, reverse=True)
+
+
+def _is_keyword_in_text(text: str, keyword_re: Optional[re.Pattern]) -> bool:
+    if not text or keyword_re is None:
         return False
-    clean_text = re.sub(r"\[CQ:at,[^\]]+\]|@\S+", "", text).strip()
-    return clean_text in keywords
+    return keyword_re.fullmatch(text) is not None
 
 
 def is_bot_mentioned(message: MaiMessages) -> bool:
@@ -291,31 +389,35 @@ def is_bot_mentioned(message: MaiMessages) -> bool:
         return False
 
     try:
-        bot_qq = str(config_api.get_global_config("bot.qq_account"))
+        bot_qq = GroupMuterPlugin._bot_qq
+        at_qq_re = GroupMuterPlugin._at_qq_re
 
-        # 检查所有消息段
-        for segment in message.message_segments:
-            # 方案1: 检查标准的 'at' 类型消息段
-            if segment.type == "at":
-                if str(segment.data.get("qq")) == bot_qq:
-                    return True
+        segments = message.message_segments
+
+        # 方案1: 先检查标准的 'at' 类型消息段，只做字符串比较，命中即返回
+        if any(segment.type == "at" and str(segment.data.get("qq")) == bot_qq for segment in segments):
+            return True
 
-            # 检查 QQ 特有的 '@<昵称:QQ号>' 格式
-            elif segment.type == "text":
-                pattern = rf'@<[^:]+:{re.escape(bot_qq)}>'
-                if re.search(pattern, str(segment.data)):
+        # 检查 QQ 特有的 '@<昵称:QQ号>' 格式
+        if at_qq_re:
+            for segment in segments:
+                if segment.type != "text":
+                    continue
+                # 先用子串检查排除不含QQ号的文本，再跑正则
+                segment_text = str(segment.data)
+                if bot_qq in segment_text and at_qq_re.search(segment_text):
                     return True
 
         # 降级检查纯文本，兼容用户手动输入 '@昵称'
         plain_text = message.plain_text or ""
-        if plain_text.strip():
-            bot_nickname = config_api.get_global_config("bot.nickname", "")
-            alias_names = config_api.get_global_config("bot.alias_names", [])
-            bot_names = {bot_nickname, *alias_names}
-
-            for name in bot_names:
-                if name and re.search(rf"@\s*{re.escape(name)}", plain_text):
-                    return True
+        at_name_re = GroupMuterPlugin._at_name_re
+        if (
+            at_name_re
+            and "@" in plain_text
+            and any(name in plain_text for name in GroupMuterPlugin._bot_names)
+            and at_name_re.search(plain_text)
+        ):
+            return True
 
     except Exception as e:
         logger.error(f"检查 @提及 时发生异常: {e}", exc_info=True)
@@ -23,9 +23,11 @@ from src.plugin_system import (
     register_plugin,
     BaseTool,
     BaseAction,
+    BaseEventHandler,
     ActionActivationType,
     ComponentInfo,
     ConfigField,
+    EventType,
     ToolParamType,
     llm_api,
     message_api
@@ -42,6 +44,7 @@ from .search_engines.tavily import TavilyEngine
 # 导入翻译工具
 from .tools.abbreviation_tool import AbbreviationTool
 from .tools.fetchers.zhihu_fetcher import ZhihuArticleFetcher
+from .translators.nbnhhsh import NbnhhshTranslator
 
 logger = get_logger("google_search")
 
@@ -823,6 +826,19 @@ class ImageSearchAction(BaseAction):
             return False, f"图片搜索失败: {str(e)}"
 
 
+class SearchSessionCloseHandler(BaseEventHandler):
+    """麦麦关闭时释放共享的 HTTP 会话"""
+
+    event_type = EventType.ON_STOP
+    handler_name = "google_search_session_close"
+    handler_description = "关闭搜索插件共享的 HTTP 会话"
+
+    async def execute(self, message):
+        await TavilyEngine.close()
+        await NbnhhshTranslator.close()
+        return True, True, None, None, None
+
+
 @register_plugin
 class google_search_simple(BasePlugin):
     """Google Search 插件"""
@@ -925,6 +941,7 @@ class google_search_simple(BasePlugin):
         components = [
             (WebSearchTool.get_tool_info(), WebSearchTool),
             (AbbreviationTool.get_tool_info(), AbbreviationTool),
+            (SearchSessionCloseHandler.get_handler_info(), SearchSessionCloseHandler),
         ]
         
         # 仅在配置启用时注册图片搜索动作
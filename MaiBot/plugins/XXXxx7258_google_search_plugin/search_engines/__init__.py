@@ -4,15 +4,39 @@
 提供统一的搜索引擎抽象接口和具体实现
 """
 
+import asyncio
+import itertools
+from typing import Iterable, List
+
 from .base import BaseSearchEngine, SearchResult
 from .google import GoogleEngine
 from .bing import BingEngine
 from .sogou import SogouEngine
 from .tavily import TavilyEngine
 
+
+async def gather_search(query: str, engines: Iterable[BaseSearchEngine], num_results: int) -> List[SearchResult]:
+    """并发查询多个搜索引擎并合并结果
+
+    各引擎独立等待网络 I/O，总耗时取决于最慢的引擎而非各引擎之和。
+    单个引擎抛出的异常会被忽略。
+
+    Args:
+        query: 搜索查询
+        engines: 要查询的搜索引擎
+        num_results: 每个引擎期望的结果数量
+
+    Returns:
+        按引擎顺序拼接的搜索结果列表
+    """
+    results = await asyncio.gather(*(engine.search(query, num_results) for engine in engines), return_exceptions=True)
+    return list(itertools.chain.from_iterable(r for r in results if isinstance(r, list)))
+
+
 __all__ = [
     "BaseSearchEngine",
     "SearchResult",
+    "gather_search",
     "GoogleEngine",
     "BingEngine",
     "SogouEngine",
@@ -1,11 +1,14 @@
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlencode
 from .base import BaseSearchEngine, SearchResult
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 logger = logging.getLogger(__name__)
 
+# 结果都位于 #b_results 内，只解析该子树
+_RESULTS_STRAINER = SoupStrainer(id="b_results")
+
 class BingEngine(BaseSearchEngine):
     """Bing 搜索引擎实现"""
     
@@ -60,6 +63,13 @@ class BingEngine(BaseSearchEngine):
             ],
         },
     }
+
+    # 回退链在类加载时展开为 (primary, *fallback)
+    _SELECTOR_CHAINS: Dict[str, Tuple[str, ...]] = {
+        name: (cfg["primary"], *cfg["fallback"]) for name, cfg in SELECTOR_CONFIG.items()
+    }
+    # title 与 url 使用同一条回退链时，标题锚点即为链接元素，无需再查询一次
+    _URL_SHARES_TITLE: bool = _SELECTOR_CHAINS["url"] == _SELECTOR_CHAINS["title"]
     
     def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
         super().__init__(config)
@@ -80,17 +90,21 @@ class BingEngine(BaseSearchEngine):
         config = self.SELECTOR_CONFIG.get(selector, {})
         return config.get("primary", "")
 
-    def _get_fallback_selectors(self, selector: str) -> list:
-        """获取备用选择器列表
+    def _select_first(self, tag: Any, selector: str) -> Any:
+        """按回退链优先级返回第一个命中的元素
 
         Args:
+            tag: 查找范围
             selector: 选择器名称
 
         Returns:
-            备用选择器列表
+            命中的元素，全部未命中时为 None
         """
-        config = self.SELECTOR_CONFIG.get(selector, {})
-        return config.get("fallback", [])
+        for css in self._SELECTOR_CHAINS[selector]:
+            elem = tag.select_one(css)
+            if elem:
+                return elem
+        return None
 
     async def _get_next_page(self, query: str) -> str:
         """构建并获取搜索页面的HTML内容
@@ -125,22 +139,28 @@ class BingEngine(BaseSearchEngine):
         Returns:
             搜索结果列表
         """
+        if num_results <= 0:
+            return []
+
         try:
             resp = await self._get_next_page(query)
-            soup = BeautifulSoup(resp, "html.parser")
-
-            # 使用主选择器查找结果
-            links_selector = self._set_selector("links")
-            links = soup.select(links_selector) if links_selector else []
-
-            # 如果主选择器失效，尝试备用选择器
-            if not links:
-                logger.warning(f"Primary links selector '{links_selector}' found no results, trying fallbacks")
-                for fallback_selector in self._get_fallback_selectors("links"):
-                    links = soup.select(fallback_selector)
-                    if links:
-                        logger.info(f"Fallback selector '{fallback_selector}' found {len(links)} results")
-                        break
+            soup = BeautifulSoup(resp, "lxml", parse_only=_RESULTS_STRAINER)
+            if not soup.contents:
+                # 页面结构变化找不到 #b_results 时，退回整页解析以便备用选择器生效
+                logger.warning("#b_results not found, parsing the whole page")
+                soup = BeautifulSoup(resp, "lxml")
+
+            # 按优先级尝试选择器；备用选择器范围更宽，合并查询会让严格的主选择器失去意义
+            links = []
+            links_chain = self._SELECTOR_CHAINS["links"]
+            for level, links_selector in enumerate(links_chain):
+                links = soup.select(links_selector)
+                if links:
+                    if level:
+                        logger.info(f"Fallback selector '{links_selector}' found {len(links)} results")
+                    break
+                if level == 0:
+                    logger.warning(f"Primary links selector '{links_selector}' found no results, trying fallbacks")
 
             if not links:
                 logger.error(f"No results found with any selector for query '{query}'")
@@ -149,47 +169,32 @@ class BingEngine(BaseSearchEngine):
             logger.info(f"Found {len(links)} link elements")
 
             results = []
-            title_selector = self._set_selector("title")
-            url_selector = self._set_selector("url")
-            text_selector = self._set_selector("text")
 
             for idx, link in enumerate(links):
                 # 处理标题，使用备用选择器
-                title_elem = link.select_one(title_selector) if title_selector else None
-                if not title_elem:
-                    for fallback in self._get_fallback_selectors("title"):
-                        title_elem = link.select_one(fallback)
-                        if title_elem:
-                            break
-                title = self.tidy_text(title_elem.text) if title_elem else ""
+                title_elem = self._select_first(link, "title")
+                title = self.tidy_text(title_elem.get_text()) if title_elem else ""
 
                 # 处理URL，使用备用选择器
-                url_elem = link.select_one(url_selector) if url_selector else None
-                if not url_elem:
-                    for fallback in self._get_fallback_selectors("url"):
-                        url_elem = link.select_one(fallback)
-                        if url_elem:
-                            break
-                url_raw = url_elem.get("href") if url_elem else ""
-                url = self._normalize_url(url_raw)
+                url_elem = title_elem if self._URL_SHARES_TITLE else self._select_first(link, "url")
+
+                # 标题或URL缺失的行（广告、"相关问题"等）直接跳过，不再处理摘要
+                if not title or not url_elem:
+                    continue
+                url = self._normalize_url(url_elem.get("href", ""))
+                if not url:
+                    continue
 
                 # 处理摘要，使用备用选择器
-                snippet = ""
-                if text_selector:
-                    snippet_elem = link.select_one(text_selector)
-                    if not snippet_elem:
-                        for fallback in self._get_fallback_selectors("text"):
-                            snippet_elem = link.select_one(fallback)
-                            if snippet_elem:
-                                break
-                    snippet = self.tidy_text(snippet_elem.text) if snippet_elem else ""
-
-                # 只有当标题和URL都有效时才添加结果
-                if title and url:
-                    results.append(SearchResult(title=title, url=url, snippet=snippet, abstract=snippet, rank=idx))
-
-            logger.info(f"Returning {len(results[:num_results])} search results for query '{query}'")
-            return results[:num_results]
+                snippet_elem = self._select_first(link, "text")
+                snippet = self.tidy_text(snippet_elem.get_text()) if snippet_elem else ""
+
+                results.append(SearchResult(title=title, url=url, snippet=snippet, abstract=snippet, rank=idx))
+                if len(results) >= num_results:
+                    break
+
+            logger.info(f"Returning {len(results)} search results for query '{query}'")
+            return results
         except Exception as e:
             logger.error(f"Error in Bing search for query {query}: {e}", exc_info=True)
             return []
@@ -1,6 +1,7 @@
 from typing import List, Dict, Any, Optional
 import asyncio
 import logging
+import threading
 
 try:
     # 导入新库
@@ -16,6 +17,25 @@ from .base import BaseSearchEngine, SearchResult
 
 logger = logging.getLogger(__name__)
 
+# 每个工作线程复用一个 DDGS 实例，保持底层 HTTP 连接，避免每次查询重新握手
+_DDGS_LOCAL = threading.local()
+
+def _get_ddgs(timeout: int) -> "DDGS":
+    """获取当前线程复用的 DDGS 实例，超时配置变化时重建
+    
+    Args:
+        timeout: 请求超时时间（秒）
+        
+    Returns:
+        DDGS 实例
+    """
+    ddgs = getattr(_DDGS_LOCAL, "ddgs", None)
+    if ddgs is None or _DDGS_LOCAL.timeout != timeout:
+        ddgs = DDGS(timeout=timeout)
+        _DDGS_LOCAL.ddgs = ddgs
+        _DDGS_LOCAL.timeout = timeout
+    return ddgs
+
 def sync_ddgs_search(query: str, search_params: Dict[str, Any]) -> List[Dict[str, Any]]:
     """在一个同步函数中执行 DDGS 文本搜索，以便在线程池中运行
     
@@ -27,8 +47,7 @@ def sync_ddgs_search(query: str, search_params: Dict[str, Any]) -> List[Dict[str
         搜索结果字典列表
     """
     timeout = search_params.pop('timeout', 10)
-    with DDGS(timeout=timeout) as ddgs:
-        return ddgs.text(query, **search_params)
+    return _get_ddgs(timeout).text(query, **search_params)
 
 def sync_ddgs_images_search(query: str, search_params: Dict[str, Any]) -> List[Dict[str, Any]]:
     """在一个同步函数中执行 DDGS 图片搜索，以便在线程池中运行
@@ -41,8 +60,7 @@ def sync_ddgs_images_search(query: str, search_params: Dict[str, Any]) -> List[D
         图片结果字典列表
     """
     timeout = search_params.pop('timeout', 10)
-    with DDGS(timeout=timeout) as ddgs:
-        return ddgs.images(query, **search_params)
+    return _get_ddgs(timeout).images(query, **search_params)
 
 class DuckDuckGoEngine(BaseSearchEngine):
     """使用新版 ddgs 库的搜索引擎实现
@@ -79,8 +97,6 @@ class DuckDuckGoEngine(BaseSearchEngine):
             搜索结果列表
         """
         try:
-            loop = asyncio.get_event_loop()
-            
             # 构建搜索参数
             search_params = {
                 'max_results': num_results,
@@ -94,12 +110,7 @@ class DuckDuckGoEngine(BaseSearchEngine):
             if self.timelimit:
                 search_params['timelimit'] = self.timelimit
             
-            search_results = await loop.run_in_executor(
-                None,
-                sync_ddgs_search,
-                query,
-                search_params
-            )
+            search_results = await asyncio.to_thread(sync_ddgs_search, query, search_params)
             
             results = []
             for i, r in enumerate(search_results):
@@ -136,8 +147,6 @@ class DuckDuckGoEngine(BaseSearchEngine):
             图片信息字典列表
         """
         try:
-            loop = asyncio.get_event_loop()
-            
             # 构建图片搜索参数
             search_params = {
                 'max_results': num_results,
@@ -150,12 +159,7 @@ class DuckDuckGoEngine(BaseSearchEngine):
             if self.timelimit:
                 search_params['timelimit'] = self.timelimit
             
-            search_results = await loop.run_in_executor(
-                None,
-                sync_ddgs_images_search,
-                query,
-                search_params
-            )
+            search_results = await asyncio.to_thread(sync_ddgs_images_search, query, search_params)
             return search_results
             
         except DDGSException as e:
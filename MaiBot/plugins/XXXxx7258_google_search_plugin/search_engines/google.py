@@ -1,5 +1,6 @@
 import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
 try:
@@ -11,6 +12,9 @@ except ImportError:
 from urllib.parse import urlencode, parse_qs, urlparse
 from .base import BaseSearchEngine, SearchResult
 
+# googlesearch 是同步阻塞调用，使用独立线程池，避免占用事件循环默认执行器
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="google_search")
+
 class GoogleEngine(BaseSearchEngine):
     """Google 搜索引擎实现"""
     
@@ -36,9 +40,9 @@ class GoogleEngine(BaseSearchEngine):
         """
         try:
             # 在线程池中执行同步的 googlesearch，避免阻塞
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             search_results = await loop.run_in_executor(
-                None,
+                _EXECUTOR,
                 lambda: list(search(
                     query,
                     advanced=True,
@@ -1,10 +1,16 @@
 import re
 import random
+import asyncio
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlencode
-from bs4 import BeautifulSoup
 from .base import BaseSearchEngine, SearchResult
 
+# 重定向页只需提取一个跳转地址，直接在原文上跑正则，无需构建DOM
+_SOGOU_REDIRECT_RE = re.compile(r'window\.location\.replace\("([^"]+)"\)')
+
+# 并发解析重定向的上限
+_REDIRECT_CONCURRENCY = 8
+
 class SogouEngine(BaseSearchEngine):
     """搜狗搜索引擎实现"""
     
@@ -44,10 +50,13 @@ class SogouEngine(BaseSearchEngine):
     
     async def search(self, query: str, num_results: int) -> List[SearchResult]:
         results = await super().search(query, num_results)
-        for result in results:
-            if result.url.startswith("/link?"):
-                result.url = self.base_urls[0] + result.url
-                result.url = await self._parse_sogou_redirect(result.url)
+        sem = asyncio.BoundedSemaphore(_REDIRECT_CONCURRENCY)
+
+        async def _resolve(result: SearchResult) -> None:
+            async with sem:
+                result.url = await self._parse_sogou_redirect(self.base_urls[0] + result.url)
+
+        await asyncio.gather(*[_resolve(r) for r in results if r.url.startswith("/link?")])
         return results
     
     async def _parse_sogou_redirect(self, url: str) -> str:
@@ -60,11 +69,7 @@ class SogouEngine(BaseSearchEngine):
             真实URL
         """
         html = await self._get_html(url)
-        soup = BeautifulSoup(html, "html.parser")
-        script = soup.find("script")
-        if script:
-            script_text = script.get_text()
-            match = re.search(r'window.location.replace\("(.+?)"\)', script_text)
-            if match:
-                return match.group(1)
+        match = _SOGOU_REDIRECT_RE.search(html)
+        if match:
+            return match.group(1)
         return url
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import os
@@ -6,6 +7,15 @@ from typing import Any, Dict, List, Optional
 
 import aiohttp
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+from src.common.tcp_connector import close_session_on_loop
+
 from .base import BaseSearchEngine, SearchResult
 
 logger = logging.getLogger(__name__)
@@ -23,6 +33,10 @@ class TavilyEngine(BaseSearchEngine):
     topic: Optional[str]
     turbo: bool
 
+    # All requests hit the same host, so one keep-alive session is shared across instances.
+    _session: Optional[aiohttp.ClientSession] = None
+    _session_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
         super().__init__(config)
         self.api_keys = self._load_api_keys()
@@ -46,27 +60,26 @@ class TavilyEngine(BaseSearchEngine):
 
         self.last_answer = None
 
-        request_max_results = min(num_results if num_results > 0 else self.max_results, self.max_results)
+        # With no results wanted, only the generated answer is worth a request.
+        answer_only = num_results <= 0
+        if answer_only and not self.include_answer:
+            return []
+
+        request_max_results = 1 if answer_only else min(num_results, self.max_results)
 
         payload: Dict[str, Any] = {
             "api_key": api_key,
             "query": query,
-            "search_depth": self.search_depth,
             "max_results": request_max_results,
             "include_answer": self.include_answer,
-            "include_raw_content": self.include_raw_content,
-            "topic": self.topic,
-            "turbo": self.turbo,
+            "include_raw_content": self.include_raw_content and not answer_only,
         }
-
-        def _include_value(value: Any) -> bool:
-            if value is None:
-                return False
-            if isinstance(value, str) and not value.strip():
-                return False
-            return True
-
-        payload = {key: value for key, value in payload.items() if _include_value(value)}
+        if isinstance(self.search_depth, str) and self.search_depth.strip():
+            payload["search_depth"] = self.search_depth.strip()
+        if self.topic:
+            payload["topic"] = self.topic
+        if self.turbo:
+            payload["turbo"] = self.turbo
 
         try:
             timeout = aiohttp.ClientTimeout(total=self.TIMEOUT)
@@ -74,31 +87,33 @@ class TavilyEngine(BaseSearchEngine):
                 "Content-Type": "application/json",
                 "Accept": "application/json",
             }
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"{self.BASE_URL}{self.SEARCH_ENDPOINT}",
-                    json=payload,
-                    headers=headers,
-                    proxy=self.proxy,
-                ) as response:
-                    response_text = await response.text()
-                    if response.status >= 400:
-                        logger.error(
-                            "Tavily search request failed with status %s; response body: %s",
-                            response.status,
-                            response_text,
-                        )
-                        return []
-
-                    if not response_text:
-                        logger.error("Tavily returned an empty response.")
-                        return []
-
-                    try:
-                        data = json.loads(response_text)
-                    except json.JSONDecodeError:
-                        logger.error("Failed to parse Tavily response as JSON: %s", response_text)
-                        return []
+            session = self._get_session()
+            async with session.post(
+                f"{self.BASE_URL}{self.SEARCH_ENDPOINT}",
+                json=payload,
+                headers=headers,
+                proxy=self.proxy,
+                timeout=timeout,
+            ) as response:
+                if response.status >= 400:
+                    logger.error(
+                        "Tavily search request failed with status %s; response body: %s",
+                        response.status,
+                        await response.text(),
+                    )
+                    return []
+
+                # Parse straight from the raw bytes; the body is only decoded to str for error logs.
+                response_body = await response.read()
+                if not response_body.strip():
+                    logger.error("Tavily returned an empty response.")
+                    return []
+
+                try:
+                    data = _json_loads(response_body)
+                except ValueError:
+                    logger.error("Failed to parse Tavily response as JSON: %s", await response.text())
+                    return []
 
         except Exception as exc:
             logger.error("Tavily search raised an exception: %s", exc, exc_info=True)
@@ -110,6 +125,9 @@ class TavilyEngine(BaseSearchEngine):
         else:
             self.last_answer = None
 
+        if answer_only:
+            return []
+
         results_data = data.get("results", []) if isinstance(data, dict) else []
         results: List[SearchResult] = []
 
@@ -139,6 +157,25 @@ class TavilyEngine(BaseSearchEngine):
 
         return results[: min(len(results), num_results)]
 
+    @classmethod
+    def _get_session(cls) -> aiohttp.ClientSession:
+        """Return the shared keep-alive session, recreating it if closed or bound to another loop."""
+        loop = asyncio.get_running_loop()
+        if cls._session is None or cls._session.closed or cls._session_loop is not loop:
+            close_session_on_loop(cls._session, cls._session_loop)
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=64, keepalive_timeout=85),
+            )
+            cls._session_loop = loop
+        return cls._session
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared session."""
+        session, cls._session, cls._session_loop = cls._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+
     def has_api_keys(self) -> bool:
         """Return True when at least one Tavily API key is available."""
         return bool(self.api_keys)
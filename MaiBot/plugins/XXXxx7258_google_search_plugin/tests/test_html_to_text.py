@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("httpx")
+bs4 = pytest.importorskip("bs4")
+pytest.importorskip("lxml")
+
+# Ensure fetcher module on path; it has no package-relative imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "tools", "fetchers"))
+
+from zhihu_fetcher import _html_to_text  # noqa: E402
+
+
+def _bs4_text(content_html):
+    """改写前的提取方式，作为对照"""
+    return bs4.BeautifulSoup(content_html, "lxml").get_text("\n", strip=True)
+
+
+HTML_CASES = [
+    "",
+    "   ",
+    "纯文本，没有标签",
+    "<p>第一段</p><p>第二段</p>",
+    "<p>  前后空白  </p>\n\n<p>\t</p><p>下一段</p>",
+    "<p>加<b>粗</b>与<i>斜体</i>混排</p>尾部文本",
+    "<div><p>段落</p><script>var x = 1;</script><style>p { color: red; }</style></div>",
+    "<p>注释<!-- 不应出现 -->之后</p>",
+    "<p>实体 &amp; &lt;tag&gt; &nbsp;空格</p>",
+    "<ul><li>一</li><li>二</li></ul><br/><blockquote>引用</blockquote>",
+    '<figure><img src="a.png"/><figcaption>图注</figcaption></figure>',
+    "<p>line<br>break</p><pre>  code\n  block  </pre>",
+]
+
+
+@pytest.mark.parametrize("content_html", HTML_CASES)
+def test_html_to_text_matches_bs4(content_html):
+    assert _html_to_text(content_html) == _bs4_text(content_html)
@@ -5,13 +5,26 @@
 import os
 import re
 import json
-import subprocess
+import asyncio
 import datetime
 from typing import Tuple, Dict, Optional, Any
 from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup, Tag
+from lxml import etree
+from lxml import html as lxml_html
+
+# 直接用lxml提取正文文本，跳过BeautifulSoup包装层；与bs4的get_text一样不含script/style
+_TEXT_XPATH = etree.XPath("//text()[not(ancestor::script or ancestor::style)]")
+
+
+def _html_to_text(content_html: str) -> str:
+    """提取HTML片段的纯文本，等价于 get_text('\n', strip=True)"""
+    if not content_html or not content_html.strip():
+        return ""
+    tree = lxml_html.fromstring(content_html)
+    return "\n".join(t.strip() for t in _TEXT_XPATH(tree) if t.strip())
+
 
 class ZhihuArticleFetcher:
     """通用知乎内容抓取器，支持文章、问题、回答"""
@@ -38,8 +51,10 @@ class ZhihuArticleFetcher:
         """关闭httpx客户端"""
         await self.httpx_client.aclose()
 
-    def _get_sign_from_node(self, url: str) -> Dict[str, str]:
+    async def _get_sign_from_node(self, url: str) -> Dict[str, str]:
         """通过原生Node.js环境执行JS获取签名
+
+        使用异步子进程，等待Node输出时不阻塞事件循环
         
         Args:
             url: 需要签名的URL路径
@@ -47,12 +62,16 @@ class ZhihuArticleFetcher:
         Returns:
             包含签名信息的字典
         """
-        command = ["node", self.js_path, url, self.cookie_string]
         try:
-            result = subprocess.run(
-                command, capture_output=True, text=True, check=True, encoding='utf-8'
+            proc = await asyncio.create_subprocess_exec(
+                "node", self.js_path, url, self.cookie_string,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
-            return json.loads(result.stdout)
+            stdout, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                raise RuntimeError(f"node退出码 {proc.returncode}: {stderr.decode('utf-8', errors='replace').strip()}")
+            return json.loads(stdout.decode('utf-8'))
         except Exception as e:
             if isinstance(e, FileNotFoundError):
                 print("❌ 错误: 'node'命令未找到。请确保Node.js已安装并配置在系统的PATH中。")
@@ -69,30 +88,32 @@ class ZhihuArticleFetcher:
         Returns:
             HTTP响应对象
         """
+        # url在重试间不变，只解析一次
+        parsed = urlparse(url)
+        path_for_sign = parsed.path
+        if parsed.query:
+            path_for_sign += "?" + parsed.query
+
         for _ in range(3):
-            path_for_sign = urlparse(url).path
-            if urlparse(url).query:
-                path_for_sign += "?" + urlparse(url).query
-            
-            sign_data = self._get_sign_from_node(path_for_sign)
+            sign_data = await self._get_sign_from_node(path_for_sign)
             
-            current_headers = self.headers.copy()
-            current_headers['Cookie'] = self.cookie_string
-            current_headers.update({
+            current_headers = {
+                **self.headers,
+                'Cookie': self.cookie_string,
                 'x-zst-81': sign_data['x-zst-81'],
                 'x-zse-96': sign_data['x-zse-96'],
-            })
+            }
 
             response = await self.httpx_client.get(url, headers=current_headers)
 
             if response.status_code != 403 or 'zh-zse-ck' not in response.text:
                 return response
 
-            soup = BeautifulSoup(response.text, 'lxml')
-            new_ck_tag = soup.find('meta', id='zh-zse-ck')
+            tree = lxml_html.fromstring(response.content)
+            new_ck_values = tree.xpath('//meta[@id="zh-zse-ck"]/@content')
 
-            if isinstance(new_ck_tag, Tag) and new_ck_tag.has_attr('content'):
-                new_ck_value = new_ck_tag['content']
+            if new_ck_values:
+                new_ck_value = new_ck_values[0]
                 self.cookie_string += f"; zh-zse-ck={new_ck_value}"
             else:
                 return response
@@ -117,8 +138,7 @@ class ZhihuArticleFetcher:
         title = data.get('title', '未知标题')
         content_html = data.get('content', '')
 
-        soup = BeautifulSoup(content_html, 'lxml')
-        content_text = soup.get_text('\n', strip=True)
+        content_text = _html_to_text(content_html)
 
         result = f"标题: {title}\n\n{content_text}"
         return True, result
@@ -150,8 +170,7 @@ class ZhihuArticleFetcher:
 
             # 解析HTML内容
             if detail:
-                soup = BeautifulSoup(detail, 'lxml')
-                detail_text = soup.get_text('\n', strip=True)
+                detail_text = _html_to_text(detail)
             else:
                 detail_text = "无详细描述"
 
@@ -190,8 +209,7 @@ class ZhihuArticleFetcher:
             created = data.get('created', 0)
 
             # 解析HTML内容
-            soup = BeautifulSoup(content, 'lxml')
-            content_text = soup.get_text('\n', strip=True)
+            content_text = _html_to_text(content)
 
             created_time = datetime.datetime.fromtimestamp(created).strftime('%Y-%m-%d %H:%M:%S') if created else '未知'
 
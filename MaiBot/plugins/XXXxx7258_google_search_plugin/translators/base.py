@@ -5,10 +5,38 @@
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+import json
+import os
+import sqlite3
+import threading
 import time
 
+# 默认持久化缓存位置：插件目录下
+_DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "translation_cache.db")
+
+# 按路径复用的SQLite连接，翻译器每次调用都会重新实例化
+_DB_CONNECTIONS: Dict[str, sqlite3.Connection] = {}
+_DB_LOCK = threading.Lock()
+
+
+def _get_db(path: str) -> sqlite3.Connection:
+    """获取（必要时创建）持久化缓存数据库连接"""
+    with _DB_LOCK:
+        conn = _DB_CONNECTIONS.get(path)
+        if conn is None:
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translation_cache ("
+                "source TEXT NOT NULL, query TEXT NOT NULL, translations TEXT NOT NULL, "
+                "timestamp REAL NOT NULL, saved_at REAL NOT NULL, PRIMARY KEY (source, query))"
+            )
+            conn.commit()
+            _DB_CONNECTIONS[path] = conn
+        return conn
+
 
 @dataclass
 class TranslationResult:
@@ -29,9 +57,13 @@ class BaseTranslator(ABC):
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
-        self.cache = {}  # 简单内存缓存
+        self.cache = OrderedDict()  # 按最近使用排序的内存缓存(LRU)
         self.cache_ttl = self.config.get("cache_ttl", 3600)  # 缓存过期时间，默认1小时
         self.max_cache_size = self.config.get("cache_size", 1000)
+        # 可选的SQLite持久化缓存，作为内存缓存之后的二级缓存，重启后仍可命中
+        self.db: Optional[sqlite3.Connection] = None
+        if self.config.get("persistent_cache", False):
+            self.db = _get_db(self.config.get("cache_path") or _DEFAULT_CACHE_PATH)
         
     @abstractmethod
     async def translate(self, query: str) -> TranslationResult:
@@ -54,44 +86,87 @@ class BaseTranslator(ABC):
     
     def _get_from_cache(self, query: str) -> Optional[TranslationResult]:
         """从缓存获取结果"""
-        if query not in self.cache:
-            return None
+        entry = self.cache.get(query)
+        if entry is None:
+            entry = self._load_from_db(query)
+            if entry is None:
+                return None
+            # 从持久化缓存提升到内存缓存，保留原写入时间以沿用TTL
+            self._put_memory(query, entry)
             
-        result, timestamp = self.cache[query]
+        cached_result, timestamp = entry
         if time.time() - timestamp > self.cache_ttl:
             # 缓存过期，删除
             del self.cache[query]
+            if self.db is not None:
+                with self.db:
+                    self.db.execute(
+                        "DELETE FROM translation_cache WHERE source = ? AND query = ?", (self.name, query)
+                    )
             return None
+        
+        # 命中后移到末尾，标记为最近使用
+        self.cache.move_to_end(query)
             
-        # 返回缓存结果，标记为缓存
-        cached_result = TranslationResult(
-            query=result.query,
-            translations=result.translations,
-            source=result.source,
-            cached=True,
-            timestamp=result.timestamp
-        )
+        # 缓存中存的已是标记为缓存的副本，直接返回
         return cached_result
     
     def _save_to_cache(self, result: TranslationResult) -> None:
         """保存结果到缓存"""
-        # 如果缓存过大，清理最旧的条目
-        if len(self.cache) >= self.max_cache_size:
-            # 删除最旧的条目
-            oldest_key = min(self.cache.keys(), 
-                           key=lambda k: self.cache[k][1])
-            del self.cache[oldest_key]
+        saved_at = time.time()
+        # 写入时一次性生成标记为缓存的副本，命中时无需再构造
+        self._put_memory(result.query, (replace(result, cached=True), saved_at))
+        
+        if self.db is not None:
+            with self.db:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO translation_cache VALUES (?, ?, ?, ?, ?)",
+                    (self.name, result.query, json.dumps(result.translations, ensure_ascii=False),
+                     result.timestamp, saved_at),
+                )
+    
+    def _put_memory(self, query: str, entry: tuple) -> None:
+        """写入内存LRU缓存"""
+        if query in self.cache:
+            self.cache.move_to_end(query)
+        elif len(self.cache) >= self.max_cache_size:
+            # 缓存已满，O(1) 淘汰最久未使用的条目
+            self.cache.popitem(last=False)
             
-        self.cache[result.query] = (result, time.time())
+        self.cache[query] = entry
+    
+    def _load_from_db(self, query: str) -> Optional[tuple]:
+        """从持久化缓存读取条目，未启用或未命中返回None"""
+        if self.db is None:
+            return None
+        row = self.db.execute(
+            "SELECT translations, timestamp, saved_at FROM translation_cache WHERE source = ? AND query = ?",
+            (self.name, query),
+        ).fetchone()
+        if row is None:
+            return None
+        translations, timestamp, saved_at = row
+        result = TranslationResult(
+            query=query,
+            translations=json.loads(translations),
+            source=self.name,
+            cached=True,
+            timestamp=timestamp
+        )
+        return result, saved_at
     
     def clear_cache(self) -> None:
         """清空缓存"""
         self.cache.clear()
+        if self.db is not None:
+            with self.db:
+                self.db.execute("DELETE FROM translation_cache WHERE source = ?", (self.name,))
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
         return {
             "cache_size": len(self.cache),
             "max_cache_size": self.max_cache_size,
-            "cache_ttl": self.cache_ttl
+            "cache_ttl": self.cache_ttl,
+            "persistent_cache": self.db is not None
         }
\ No newline at end of file
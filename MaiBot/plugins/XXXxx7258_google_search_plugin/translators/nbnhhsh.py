@@ -5,18 +5,33 @@
 https://lab.magiconch.com/api/nbnhhsh/
 """
 
+import re
 import aiohttp
 import asyncio
 from typing import List, Dict, Any, Optional
 from src.common.logger import get_logger
+from src.common.tcp_connector import close_session_on_loop
 from .base import BaseTranslator, TranslationResult
 
 logger = get_logger("nbnhhsh_translator")
 
+# 匹配 "xxx是什么" 或 "xxx是啥" 的模式
+_ABBR_RE = re.compile(r"^([a-z0-9]{2,})(?:是什么|是啥)$")
+
+# API只能识别字母数字缩写，不符合的输入无需请求
+_QUERY_RE = re.compile(r"[A-Za-z0-9]{2,20}")
+
 
 class NbnhhshTranslator(BaseTranslator):
     """神奇海螺缩写翻译器"""
     
+    # 所有请求都发往同一个API，跨实例共享一个长连接会话
+    _session: Optional[aiohttp.ClientSession] = None
+    _session_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    # 正在请求中的查询，同一缩写的并发查询共享一次API调用
+    _inflight: Dict[str, "asyncio.Future[List[str]]"] = {}
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         super().__init__(config)
         self.api_url = self.config.get("api_url", "https://lab.magiconch.com/api/nbnhhsh/guess")
@@ -27,6 +42,25 @@ class NbnhhshTranslator(BaseTranslator):
     def name(self) -> str:
         return "nbnhhsh"
     
+    @classmethod
+    def _get_session(cls) -> aiohttp.ClientSession:
+        """获取共享会话，已关闭或不属于当前事件循环时重新创建"""
+        loop = asyncio.get_running_loop()
+        if cls._session is None or cls._session.closed or cls._session_loop is not loop:
+            close_session_on_loop(cls._session, cls._session_loop)
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=64, keepalive_timeout=85),
+            )
+            cls._session_loop = loop
+        return cls._session
+    
+    @classmethod
+    async def close(cls) -> None:
+        """关闭共享会话"""
+        session, cls._session, cls._session_loop = cls._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+    
     async def translate(self, query: str) -> TranslationResult:
         """
         翻译缩写
@@ -37,7 +71,7 @@ class NbnhhshTranslator(BaseTranslator):
         Returns:
             TranslationResult: 翻译结果
         """
-        if not query:
+        if not query or not _QUERY_RE.fullmatch(query):
             return TranslationResult(
                 query=query,
                 translations=[],
@@ -50,8 +84,27 @@ class NbnhhshTranslator(BaseTranslator):
             logger.info(f"从缓存获取翻译结果: {query}")
             return cached_result
         
-        # 调用API获取翻译
-        translations = await self._call_api(query)
+        # 已有相同查询在请求中，直接等待其结果
+        inflight = self._inflight.get(query)
+        if inflight is not None:
+            translations = await asyncio.shield(inflight)
+            return TranslationResult(
+                query=query,
+                translations=translations,
+                source=self.name
+            )
+        
+        # 检查与登记之间没有await，单线程事件循环下无需加锁
+        future: "asyncio.Future[List[str]]" = asyncio.get_running_loop().create_future()
+        self._inflight[query] = future
+        translations: List[str] = []
+        try:
+            # 调用API获取翻译
+            translations = await self._call_api(query)
+        finally:
+            # 本次调用被取消时，等待者按无结果处理
+            future.set_result(translations)
+            self._inflight.pop(query, None)
         
         result = TranslationResult(
             query=query,
@@ -65,6 +118,48 @@ class NbnhhshTranslator(BaseTranslator):
         logger.info(f"翻译完成: {query} -> {translations}")
         return result
     
+    async def translate_many(self, queries: List[str]) -> List[TranslationResult]:
+        """
+        批量翻译缩写，未命中缓存的缩写合并为一次API请求
+        
+        Args:
+            queries: 待翻译的缩写列表
+            
+        Returns:
+            List[TranslationResult]: 与输入顺序一致的翻译结果
+        """
+        results: Dict[str, TranslationResult] = {}
+        uncached: List[str] = []
+        for query in dict.fromkeys(queries):
+            if not query or not _QUERY_RE.fullmatch(query):
+                results[query] = TranslationResult(query=query, translations=[], source=self.name)
+                continue
+            cached_result = self._get_from_cache(query)
+            if cached_result:
+                results[query] = cached_result
+            else:
+                uncached.append(query)
+        
+        if uncached:
+            # API按逗号拆分输入，返回的每项以name标识对应的缩写
+            data = await self._post_guess(",".join(uncached), uncached) or []
+            trans_by_name = {
+                str(item.get("name", "")).lower(): item.get("trans") or []
+                for item in data
+                if isinstance(item, dict)
+            }
+            for query in uncached:
+                result = TranslationResult(
+                    query=query,
+                    translations=trans_by_name.get(query.lower(), []),
+                    source=self.name
+                )
+                self._save_to_cache(result)
+                results[query] = result
+            logger.info(f"批量翻译完成: {len(uncached)}个缩写，1次API请求")
+        
+        return [results[query] for query in queries]
+    
     async def _call_api(self, query: str) -> List[str]:
         """
         调用神奇海螺API
@@ -75,41 +170,55 @@ class NbnhhshTranslator(BaseTranslator):
         Returns:
             List[str]: 翻译结果列表
         """
+        data = await self._post_guess(query, query)
+        if data and len(data) > 0:
+            # 提取翻译结果
+            result_item = data[0]
+            if "trans" in result_item and result_item["trans"]:
+                return result_item["trans"]
+        return []
+    
+    async def _post_guess(self, text: str, label: Any) -> Optional[List[Dict[str, Any]]]:
+        """
+        向神奇海螺API发送请求，失败时按递增延迟重试
+        
+        Args:
+            text: 请求体中的text字段，多个缩写以逗号分隔
+            label: 日志中标识本次请求的内容
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: API返回的数据，失败返回None
+        """
         for attempt in range(self.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        self.api_url,
-                        json={"text": query},
-                        headers={"Content-Type": "application/json"},
-                        timeout=aiohttp.ClientTimeout(total=self.timeout),
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data and len(data) > 0:
-                                # 提取翻译结果
-                                result_item = data[0]
-                                if "trans" in result_item and result_item["trans"]:
-                                    return result_item["trans"]
-                        
-                        logger.warning(f"API请求失败，状态码: {response.status}")
-                        return []
+                session = self._get_session()
+                async with session.post(
+                    self.api_url,
+                    json={"text": text},
+                    headers={"Content-Type": "application/json"},
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                ) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    
+                    logger.warning(f"API请求失败，状态码: {response.status}")
+                    return None
                         
             except asyncio.TimeoutError:
                 logger.warning(f"API请求超时，尝试 {attempt + 1}/{self.max_retries}")
                 if attempt == self.max_retries - 1:
-                    logger.error(f"API请求最终超时: {query}")
+                    logger.error(f"API请求最终超时: {label}")
                     
             except Exception as e:
                 logger.error(f"API请求出错，尝试 {attempt + 1}/{self.max_retries}: {e}")
                 if attempt == self.max_retries - 1:
-                    logger.error(f"API请求最终失败: {query}")
+                    logger.error(f"API请求最终失败: {label}")
                     
             # 重试前等待
             if attempt < self.max_retries - 1:
                 await asyncio.sleep(1 * (attempt + 1))  # 递增延迟
         
-        return []
+        return None
     
     def is_abbreviation_query(self, query: str) -> bool:
         """
@@ -121,11 +230,7 @@ class NbnhhshTranslator(BaseTranslator):
         Returns:
             bool: 是否为缩写查询
         """
-        import re
-        # 匹配 "xxx是什么" 或 "xxx是啥" 的模式
-        pattern = r"^([a-z0-9]{2,})(?:是什么|是啥)$"
-        match = re.match(pattern, query.lower().strip())
-        return match is not None
+        return _ABBR_RE.match(query.lower().strip()) is not None
     
     def extract_abbreviation(self, query: str) -> Optional[str]:
         """
@@ -137,9 +242,7 @@ class NbnhhshTranslator(BaseTranslator):
         Returns:
             Optional[str]: 提取的缩写，如果不匹配则返回None
         """
-        import re
-        pattern = r"^([a-z0-9]{2,})(?:是什么|是啥)$"
-        match = re.match(pattern, query.lower().strip())
+        match = _ABBR_RE.match(query.lower().strip())
         if match:
             return match.group(1)
         return None
\ No newline at end of file
@@ -8,9 +8,11 @@ from typing import List, Tuple, Type
 
 from src.plugin_system import (
     BasePlugin,
+    BaseEventHandler,
     register_plugin,
     ComponentInfo,
     ConfigField,
+    EventType,
 )
 from src.common.logger import get_logger
 
@@ -19,6 +21,18 @@ from .tools.abbreviation_tool import AbbreviationTool
 logger = get_logger("nbnhhsh_translate_plugin")
 
 
+class TranslatorCloseHandler(BaseEventHandler):
+    """麦麦关闭时释放共享翻译器的 HTTP 会话"""
+
+    event_type = EventType.ON_STOP
+    handler_name = "nbnhhsh_translator_close"
+    handler_description = "关闭神奇海螺翻译器的 HTTP 会话"
+
+    async def execute(self, message):
+        await AbbreviationTool.close_translators()
+        return True, True, None, None, None
+
+
 @register_plugin
 class NbnhhshTranslatePlugin(BasePlugin):
     """神奇海螺缩写翻译插件"""
@@ -47,6 +61,10 @@ class NbnhhshTranslatePlugin(BasePlugin):
             "max_retries": ConfigField(type=int, default=3, description="请求最大重试次数"),
             "cache_ttl": ConfigField(type=int, default=3600, description="缓存有效期（秒）"),
             "cache_size": ConfigField(type=int, default=1000, description="缓存条目上限"),
+            "neg_cache_ttl": ConfigField(type=int, default=300, description="查无结果的缓存有效期（秒）"),
+            "cache_path": ConfigField(type=str, default="", description="磁盘缓存文件路径（SQLite），留空则只使用内存缓存"),
+            "conn_limit": ConfigField(type=int, default=20, description="HTTP 连接池总连接数上限"),
+            "conn_limit_per_host": ConfigField(type=int, default=10, description="对 API 主机的并发连接数上限"),
         },
     }
 
@@ -64,5 +82,6 @@ class NbnhhshTranslatePlugin(BasePlugin):
         """返回插件组件列表"""
         return [
             (AbbreviationTool.get_tool_info(), AbbreviationTool),
+            (TranslatorCloseHandler.get_handler_info(), TranslatorCloseHandler),
         ]
 
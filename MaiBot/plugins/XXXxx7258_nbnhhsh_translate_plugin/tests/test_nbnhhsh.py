@@ -0,0 +1,125 @@
+import asyncio
+import os
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+# Ensure plugin root on path for importing the translators package
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+# Stub modules required by the translators
+def get_logger(name):  # pragma: no cover - simple logger stub
+    class Logger:
+        def info(self, *args, **kwargs):
+            pass
+
+        def warning(self, *args, **kwargs):
+            pass
+
+        def error(self, *args, **kwargs):
+            pass
+
+        def exception(self, *args, **kwargs):
+            pass
+
+    return Logger()
+
+
+sys.modules.setdefault("src", types.ModuleType("src"))
+sys.modules.setdefault("src.common", types.ModuleType("src.common"))
+logger_module = types.ModuleType("src.common.logger")
+logger_module.get_logger = get_logger
+sys.modules.setdefault("src.common.logger", logger_module)
+
+from translators.base import TranslationResult, _norm  # noqa: E402
+from translators.nbnhhsh import _VALID_TERM_RE, NbnhhshTranslator  # noqa: E402
+
+
+class RecordingTranslator(NbnhhshTranslator):
+    """记录发往 API 的文本，不发起真实请求"""
+
+    def __init__(self, responses=None):
+        super().__init__({})
+        self.posted = []
+        self.responses = responses or {}
+
+    async def _post(self, text):
+        self.posted.append(text)
+        return [{"name": name.lower(), "trans": self.responses.get(name.lower(), [])} for name in text.split(",")]
+
+
+@pytest.mark.parametrize("term", ["yyds", "u1s1", "YYDS", "a", "x" * 32, "2333"])
+def test_valid_term_accepts_alphanumeric(term):
+    assert _VALID_TERM_RE.fullmatch(term.lower())
+
+
+@pytest.mark.parametrize(
+    "term",
+    ["", "躺平", "yyds，", "yyds,", "yyds ", " yyds", "yyds\n", "yy-ds", "x" * 33, "ｙｙｄｓ"],
+)
+def test_valid_term_rejects_other_input(term):
+    assert not _VALID_TERM_RE.fullmatch(term.lower())
+
+
+@pytest.mark.parametrize("term", ["躺平", "yyds\n", "yy ds", ""])
+def test_translate_skips_api_for_invalid_terms(term):
+    translator = RecordingTranslator()
+    result = asyncio.run(translator.translate(term))
+    assert result.translations == []
+    assert translator.posted == []
+
+
+def test_translate_calls_api_for_valid_term():
+    translator = RecordingTranslator({"yyds": ["永远的神"]})
+    result = asyncio.run(translator.translate("yyds"))
+    assert result.translations == ["永远的神"]
+    assert translator.posted == ["yyds"]
+
+
+def test_translate_many_only_sends_valid_terms():
+    translator = RecordingTranslator({"yyds": ["永远的神"], "u1s1": ["有一说一"]})
+    results = asyncio.run(translator.translate_many(["yyds", "躺平", "u1s1", "内卷"]))
+    assert [r.query for r in results] == ["yyds", "躺平", "u1s1", "内卷"]
+    assert [r.translations for r in results] == [["永远的神"], [], ["有一说一"], []]
+    assert translator.posted == ["yyds,u1s1"]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [("yyds", "yyds"), ("YYDS", "yyds"), ("  YyDs\t", "yyds"), ("Straße", "strasse"), ("", "")],
+)
+def test_norm(query, expected):
+    assert _norm(query) == expected
+
+
+def test_cache_shared_across_case_and_whitespace():
+    translator = RecordingTranslator()
+    translator._save_to_cache(TranslationResult(query="YYDS", translations=["永远的神"], source="nbnhhsh"))
+    cached = translator._get_from_cache(" yyds ")
+    assert cached is not None
+    assert cached.translations == ["永远的神"]
+    # 展示时保留调用方的原始写法
+    assert cached.query == " yyds "
+    assert list(translator.cache) == ["yyds"]
+
+
+def test_negative_cache_shared_across_case():
+    translator = RecordingTranslator()
+    translator._remember_miss("ABC")
+    assert translator._is_known_miss("abc")
+    assert translator._is_known_miss(" Abc ")
+
+
+def test_translate_variants_hit_one_cache_entry():
+    translator = RecordingTranslator({"yyds": ["永远的神"]})
+    # 第二次查到结果时才写入缓存
+    asyncio.run(translator.translate("yyds"))
+    asyncio.run(translator.translate("YYDS"))
+    result = asyncio.run(translator.translate("Yyds"))
+    assert result.cached
+    assert result.translations == ["永远的神"]
+    assert len(translator.posted) == 2
@@ -4,7 +4,9 @@
 提供中文网络缩写词汇翻译功能
 """
 
-from typing import Any, Dict, List, Tuple
+import logging
+import re
+from typing import Any, ClassVar, Dict, List, Tuple
 
 from src.common.logger import get_logger
 from src.plugin_system import BaseTool, ToolParamType
@@ -13,6 +15,27 @@ from ..translators.nbnhhsh import NbnhhshTranslator
 
 logger = get_logger("nbnhhsh_abbreviation_tool")
 
+# 翻译器实际读取的配置项，用作共享实例的键
+_TRANSLATOR_CONFIG_KEYS: Tuple[str, ...] = (
+    "api_url",
+    "timeout",
+    "max_retries",
+    "conn_limit",
+    "conn_limit_per_host",
+    "neg_cache_ttl",
+    "cache_ttl",
+    "cache_size",
+    "cache_path",
+)
+
+# 多个词汇之间的分隔符（逗号、顿号或空白）
+_TERM_SEP_RE = re.compile(r"[,，、\s]+")
+
+
+def _take(items: List[str], limit: int) -> List[str]:
+    """取前 limit 项，列表本身不超过上限时不复制"""
+    return items if len(items) <= limit else items[:limit]
+
 
 class AbbreviationTool(BaseTool):
     """独立的神奇海螺缩写翻译工具"""
@@ -22,24 +45,41 @@ class AbbreviationTool(BaseTool):
         "当遇到用户消息中出现难懂的网络用语、缩写、黑话、热词或流行语时，"
         "主动查询并翻译这些词汇以帮助理解。适用于各种类型的网络语言，包括字母缩写"
         "（如 yyds、u1s1）、网络黑话、当下热词、流行语等。应该识别消息中可能让人困惑的"
-        "网络用语并自动查询其含义。"
+        "网络用语并自动查询其含义。注意：仅能翻译由字母和数字组成的缩写，纯中文词汇不会返回结果。"
     )
     parameters: List[Tuple[str, ToolParamType, str, bool, None]] = [
-        ("term", ToolParamType.STRING, "从用户消息中识别出的网络用语、缩写或热词（如：yyds、躺平、内卷等）。", True, None),
+        ("term", ToolParamType.STRING, "从用户消息中识别出的网络用语、缩写或热词（如：yyds、躺平、内卷等），多个词汇可用逗号分隔。", True, None),
         ("max_results", ToolParamType.INTEGER, "返回翻译结果数量，默认为 3。", False, None),
     ]
     available_for_llm: bool = True
 
     translator: NbnhhshTranslator
 
+    # 工具按调用实例化，翻译器（及其连接池、缓存）按配置在进程内共享
+    _translators: ClassVar[Dict[Tuple[Any, ...], NbnhhshTranslator]] = {}
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self._initialize_translator()
-
-    def _initialize_translator(self) -> None:
-        """初始化翻译器实例"""
         translation_config = self.plugin_config.get("translation", {})
-        self.translator = NbnhhshTranslator(translation_config)
+        self.translator = type(self)._get_translator(translation_config)
+
+    @classmethod
+    def _get_translator(cls, config: Dict[str, Any]) -> NbnhhshTranslator:
+        """获取与配置对应的共享翻译器，首次使用时创建"""
+        key = tuple(config.get(name) for name in _TRANSLATOR_CONFIG_KEYS)
+        translator = cls._translators.get(key)
+        if translator is None:
+            translator = NbnhhshTranslator(config)
+            cls._translators[key] = translator
+        return translator
+
+    @classmethod
+    async def close_translators(cls) -> None:
+        """关闭所有共享翻译器的 HTTP 会话"""
+        translators = list(cls._translators.values())
+        cls._translators.clear()
+        for translator in translators:
+            await translator.close()
 
     async def execute(self, function_args: Dict[str, Any]) -> Dict[str, str]:
         """执行缩写翻译"""
@@ -53,31 +93,58 @@ class AbbreviationTool(BaseTool):
             if not self.plugin_config.get("translation", {}).get("enabled", True):
                 return {"name": self.name, "content": "翻译功能已禁用"}
 
-            logger.info(f"[nbnhhsh] 主动翻译检测到的词汇: {term}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[nbnhhsh] 主动翻译检测到的词汇: {term}")
 
+            # LLM 通常直接传入整数，只有其他类型才走转换与异常处理
+            if type(max_results) is int:
+                limit = max_results if max_results > 0 else 1
+            else:
+                try:
+                    limit = int(max_results)
+                    if limit <= 0:
+                        limit = 1
+                except (TypeError, ValueError):
+                    limit = 3
+
+            terms = list(dict.fromkeys(part for part in _TERM_SEP_RE.split(term) if part))
+            if not terms:
+                return {"name": self.name, "content": "未提供要翻译的词汇"}
+            if len(terms) > 1:
+                # 多个词汇合并为一次批量请求
+                results = await self.translator.translate_many(terms)
+                found = [self._format_translations(r.query, _take(r.translations, limit)) for r in results if r.translations]
+                missing = [r.query for r in results if not r.translations]
+                if not found:
+                    return {"name": self.name, "content": f"未找到「{'、'.join(missing)}」的翻译结果"}
+                if missing:
+                    found.append(f"未找到「{'、'.join(missing)}」的翻译结果")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"[nbnhhsh] 批量翻译完成: {len(terms)} 个词汇，{len(terms) - len(missing)} 个有结果")
+                return {"name": self.name, "content": "\n\n".join(found)}
+
+            # 只有一个词汇时使用拆分后的结果，去掉 "yyds，" 这类输入末尾的分隔符
+            term = terms[0]
             result = await self.translator.translate(term)
             if not result.translations:
                 return {"name": self.name, "content": f"未找到「{term}」的翻译结果"}
 
-            try:
-                limit = int(max_results)
-                if limit <= 0:
-                    limit = 1
-            except (TypeError, ValueError):
-                limit = 3
-
-            translations = result.translations[:limit]
-
-            if len(translations) == 1:
-                content = f"网络用语「{term}」的含义是：{translations[0]}"
-            else:
-                content = "网络用语「{term}」的可能含义：\n".format(term=term)
-                content += "\n".join(f"• {trans}" for trans in translations)
+            translations = _take(result.translations, limit)
+            content = self._format_translations(term, translations)
 
-            logger.info(f"[nbnhhsh] 主动翻译完成: {term} -> {len(translations)} 个结果")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[nbnhhsh] 主动翻译完成: {term} -> {len(translations)} 个结果")
             return {"name": self.name, "content": content}
 
         except Exception as exc:
             logger.error(f"缩写翻译执行异常: {exc}", exc_info=True)
             return {"name": self.name, "content": f"缩写翻译失败: {exc}"}
 
+    @staticmethod
+    def _format_translations(term: str, translations: List[str]) -> str:
+        """格式化单个词汇的翻译结果"""
+        if len(translations) == 1:
+            return f"网络用语「{term}」的含义是：{translations[0]}"
+        content = "网络用语「{term}」的可能含义：\n".format(term=term)
+        content += "\n".join(f"• {trans}" for trans in translations)
+        return content
@@ -5,10 +5,33 @@
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import heapq
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
 import time
 
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _json_loads = json.loads
+
+# 每写入多少次检查一次磁盘缓存行数
+_DISK_PRUNE_INTERVAL = 100
+
+
+def _norm(query: str) -> str:
+    """缓存键规范化，大小写和首尾空白不同的写法共用一个缓存条目"""
+    return query.casefold().strip()
+
 
 @dataclass
 class TranslationResult:
@@ -30,9 +53,22 @@ class BaseTranslator(ABC):
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
-        self.cache: Dict[str, Any] = {}
+        self.cache: "OrderedDict[str, Tuple[TranslationResult, float]]" = OrderedDict()  # LRU 顺序
         self.cache_ttl = self.config.get("cache_ttl", 3600)  # 默认缓存 1 小时
         self.max_cache_size = self.config.get("cache_size", 1000)
+        # (过期时间, 查询) 最小堆，只需弹出已到期的条目，无需扫描整个缓存
+        self._exp_heap: List[Tuple[float, str]] = []
+        # 可选的磁盘缓存，作为内存 LRU 之后的二级缓存，重启后仍可命中
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_writes = 0
+        cache_path = self.config.get("cache_path")
+        if cache_path:
+            self._db = sqlite3.connect(cache_path, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translation_cache "
+                "(query TEXT PRIMARY KEY, translations BLOB, ts REAL)"
+            )
 
     @abstractmethod
     async def translate(self, query: str) -> TranslationResult:
@@ -47,17 +83,22 @@ class BaseTranslator(ABC):
 
     def _get_from_cache(self, query: str) -> Optional[TranslationResult]:
         """从缓存获取结果"""
-        entry = self.cache.get(query)
+        self._drain_expired()
+        key = _norm(query)
+        entry = self.cache.get(key)
         if not entry:
-            return None
+            entry = self._load_from_disk(key)
+            if not entry:
+                return None
 
         result, timestamp = entry
         if time.time() - timestamp > self.cache_ttl:
-            del self.cache[query]
+            del self.cache[key]
             return None
 
+        self.cache.move_to_end(key)
         return TranslationResult(
-            query=result.query,
+            query=query,
             translations=result.translations,
             source=result.source,
             cached=True,
@@ -66,15 +107,83 @@ class BaseTranslator(ABC):
 
     def _save_to_cache(self, result: TranslationResult) -> None:
         """保存结果到缓存"""
-        if len(self.cache) >= self.max_cache_size:
-            oldest_key = min(self.cache, key=lambda key: self.cache[key][1])
-            del self.cache[oldest_key]
-
-        self.cache[result.query] = (result, time.time())
+        now = time.time()
+        self._drain_expired(now)
+        key = _norm(result.query)
+        self._put_memory(key, result, now)
+        self._save_to_disk(key, result, now)
+
+    def _cache_key(self, query: str) -> str:
+        """返回查询对应的缓存键"""
+        return _norm(query)
+
+    def _put_memory(self, key: str, result: TranslationResult, timestamp: float) -> None:
+        """写入内存 LRU，并登记过期时间"""
+        self.cache.pop(key, None)
+        # 按最近最少使用淘汰，O(1)
+        while self.cache and len(self.cache) >= self.max_cache_size:
+            self.cache.popitem(last=False)
+
+        self.cache[key] = (result, timestamp)
+        heapq.heappush(self._exp_heap, (timestamp + self.cache_ttl, key))
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[TranslationResult, float]]:
+        """内存未命中时查询磁盘缓存，未过期的条目提升回内存"""
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT translations, ts FROM translation_cache WHERE query = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        translations, timestamp = row
+        if time.time() - timestamp > self.cache_ttl:
+            return None
+        result = TranslationResult(
+            query=key, translations=_json_loads(translations), source=self.name, timestamp=timestamp
+        )
+        # 保留原写入时间，TTL 照常生效
+        self._put_memory(key, result, timestamp)
+        return result, timestamp
+
+    def _save_to_disk(self, key: str, result: TranslationResult, timestamp: float) -> None:
+        """写入磁盘缓存，行数超过内存上限 10 倍时删除最旧的行"""
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO translation_cache VALUES (?, ?, ?)",
+            (key, _json_dumps(result.translations), timestamp),
+        )
+        self._disk_writes += 1
+        if self._disk_writes % _DISK_PRUNE_INTERVAL:
+            return
+        limit = 10 * self.max_cache_size
+        (count,) = self._db.execute("SELECT COUNT(*) FROM translation_cache").fetchone()
+        if count > limit:
+            self._db.execute(
+                "DELETE FROM translation_cache WHERE query IN "
+                "(SELECT query FROM translation_cache ORDER BY ts LIMIT ?)",
+                (count - limit,),
+            )
+
+    def _drain_expired(self, now: Optional[float] = None) -> None:
+        """弹出堆顶所有已到期的条目并从缓存中删除"""
+        if now is None:
+            now = time.time()
+        heap = self._exp_heap
+        while heap and heap[0][0] <= now:
+            _, query = heapq.heappop(heap)
+            entry = self.cache.get(query)
+            # 条目可能已被重新写入，以缓存中记录的写入时间为准
+            if entry and entry[1] + self.cache_ttl <= now:
+                del self.cache[query]
 
     def clear_cache(self) -> None:
         """清空缓存"""
         self.cache.clear()
+        self._exp_heap.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM translation_cache")
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
@@ -82,5 +191,6 @@ class BaseTranslator(ABC):
             "cache_size": len(self.cache),
             "max_cache_size": self.max_cache_size,
             "cache_ttl": self.cache_ttl,
+            "disk_cache": self._db is not None,
         }
 
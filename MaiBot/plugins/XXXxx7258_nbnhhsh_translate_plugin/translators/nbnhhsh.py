@@ -6,17 +6,44 @@ https://lab.magiconch.com/api/nbnhhsh/
 """
 
 import asyncio
+import json
+import random
 import re
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
 import aiohttp
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 from src.common.logger import get_logger
 
 from .base import BaseTranslator, TranslationResult
 
 logger = get_logger("nbnhhsh_translator")
 
+_ABBR_RE = re.compile(r"^([a-z0-9]{2,})(?:是什么|是啥)$")
+
+# API 只能解析字母数字缩写，其余输入（如中文热词）必然查无结果
+_VALID_TERM_RE = re.compile(r"[a-z0-9]{1,32}")
+
+
+def _as_str_list(items: List[Any]) -> List[str]:
+    """API 返回的本就是字符串列表时直接复用，否则逐项转换"""
+    if all(isinstance(item, str) for item in items):
+        return items
+    return [item if isinstance(item, str) else str(item) for item in items]
+
 
 class NbnhhshTranslator(BaseTranslator):
     """神奇海螺缩写翻译器"""
@@ -26,14 +53,48 @@ class NbnhhshTranslator(BaseTranslator):
         self.api_url = self.config.get("api_url", "https://lab.magiconch.com/api/nbnhhsh/guess")
         self.timeout = self.config.get("timeout", 10)
         self.max_retries = self.config.get("max_retries", 3)
+        # 超时对象只构建一次，每次请求直接复用
+        self._request_timeout = aiohttp.ClientTimeout(total=self.timeout, connect=min(self.timeout, 5))
+        # 只访问单一主机，连接数上限按需配置
+        self.conn_limit = self.config.get("conn_limit", 20)
+        self.conn_limit_per_host = self.config.get("conn_limit_per_host", 10)
+        self._session: Optional[aiohttp.ClientSession] = None
+        # 查无结果的缩写短期缓存，避免重复请求；容量为正向缓存的四分之一
+        self.neg_cache_ttl = self.config.get("neg_cache_ttl", 300)
+        self._neg_cache: "OrderedDict[str, float]" = OrderedDict()
+        # 进行中的请求，同一缩写的并发查询共享一次 API 调用
+        self._inflight: "Dict[str, asyncio.Future[Optional[List[str]]]]" = {}
+        # 只出现过一次的查询，第二次查到时才写入缓存，避免一次性查询挤掉热点条目
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
 
     @property
     def name(self) -> str:
         return "nbnhhsh"
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取复用的 HTTP 会话，首次使用或已关闭时创建"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self._request_timeout,
+                json_serialize=_json_dumps,
+                connector=aiohttp.TCPConnector(
+                    limit=self.conn_limit,
+                    limit_per_host=self.conn_limit_per_host,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True,
+                ),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """关闭 HTTP 会话"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
     async def translate(self, query: str) -> TranslationResult:
         """翻译缩写词"""
-        if not query:
+        if not query or not _VALID_TERM_RE.fullmatch(query.lower()):
             return TranslationResult(query=query, translations=[], source=self.name)
 
         cached = self._get_from_cache(query)
@@ -41,35 +102,158 @@ class NbnhhshTranslator(BaseTranslator):
             logger.info("从缓存获取翻译结果: %s", query)
             return cached
 
-        translations = await self._call_api(query)
+        if self._is_known_miss(query):
+            return TranslationResult(query=query, translations=[], source=self.name, cached=True)
+
+        translations = await self._call_api_coalesced(query)
+        if translations is None:
+            # 请求失败不做负缓存，下次仍会重试
+            translations = []
+        elif not translations:
+            self._remember_miss(query)
         result = TranslationResult(query=query, translations=translations, source=self.name)
         if translations:
-            self._save_to_cache(result)
+            self._admit_to_cache(result)
 
         logger.info("翻译完成: %s -> %s", query, translations)
         return result
 
-    async def _call_api(self, query: str) -> List[str]:
-        """调用神奇海螺 API"""
-        payload = {"text": query}
+    async def _call_api_coalesced(self, query: str) -> Optional[List[str]]:
+        """合并同一缩写的并发请求，后到的调用等待首个调用的结果"""
+        key = self._cache_key(query)
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            translations = await self._call_api(query)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                # 发起者被取消，等待者按请求失败处理
+                future.set_result(None)
+            else:
+                future.set_exception(exc)
+                # 避免无人等待时出现 "exception was never retrieved" 警告
+                future.exception()
+            raise
+        else:
+            future.set_result(translations)
+            return translations
+        finally:
+            self._inflight.pop(key, None)
+
+    def _admit_to_cache(self, result: TranslationResult) -> None:
+        """准入控制：同一查询第二次查到结果时才写入缓存"""
+        key = self._cache_key(result.query)
+        if key in self._seen:
+            del self._seen[key]
+            self._save_to_cache(result)
+            return
+        self._seen[key] = None
+        while len(self._seen) > self.max_cache_size * 2:
+            self._seen.popitem(last=False)
+
+    def _is_known_miss(self, query: str) -> bool:
+        """检查负缓存中是否有未过期的查无结果记录"""
+        key = self._cache_key(query)
+        expire_at = self._neg_cache.get(key)
+        if expire_at is None:
+            return False
+        if expire_at <= time.time():
+            del self._neg_cache[key]
+            return False
+        return True
+
+    def _remember_miss(self, query: str) -> None:
+        """记录查无结果的缩写，超出容量时淘汰最早的记录"""
+        key = self._cache_key(query)
+        self._neg_cache.pop(key, None)
+        self._neg_cache[key] = time.time() + self.neg_cache_ttl
+        limit = max(1, self.max_cache_size // 4)
+        while len(self._neg_cache) > limit:
+            self._neg_cache.popitem(last=False)
+
+    async def translate_many(self, queries: List[str]) -> List[TranslationResult]:
+        """批量翻译缩写词，未命中缓存的部分合并为一次 API 请求，结果与输入顺序一致"""
+        results: Dict[str, TranslationResult] = {}
+        pending: List[str] = []
+        for query in dict.fromkeys(queries):
+            if not query or not _VALID_TERM_RE.fullmatch(query.lower()):
+                results[query] = TranslationResult(query=query, translations=[], source=self.name)
+                continue
+            cached = self._get_from_cache(query)
+            if cached:
+                results[query] = cached
+            elif self._is_known_miss(query):
+                results[query] = TranslationResult(query=query, translations=[], source=self.name, cached=True)
+            else:
+                pending.append(query)
+
+        if pending:
+            batch = await self._call_api_batch(pending)
+            for query in pending:
+                translations = batch.get(query.lower()) if batch is not None else None
+                if translations is None:
+                    # 请求失败，或 API 未返回该词（可能被拆分），均不做负缓存
+                    translations = []
+                elif not translations:
+                    self._remember_miss(query)
+                result = TranslationResult(query=query, translations=translations, source=self.name)
+                if translations:
+                    self._admit_to_cache(result)
+                results[query] = result
+            logger.info("批量翻译完成: %s 个词，1 次 API 请求", len(pending))
+
+        return [results[query] for query in queries]
+
+    async def _call_api(self, query: str) -> Optional[List[str]]:
+        """调用神奇海螺 API，API 正常返回时给出翻译列表（可能为空），请求失败返回 None"""
+        data = await self._post(query)
+        if data is None:
+            return None
+        if not data:
+            return []
+
+        first_item = data[0]
+        return _as_str_list(first_item.get("trans") or [])
+
+    async def _call_api_batch(self, queries: List[str]) -> Optional[Dict[str, List[str]]]:
+        """一次请求查询多个缩写，返回 {缩写: 翻译列表}，请求失败返回 None"""
+        data = await self._post(",".join(queries))
+        if data is None:
+            return None
+        # API 返回的每一项以 name 标识对应的缩写
+        return {
+            str(item.get("name", "")).lower(): _as_str_list(item.get("trans") or [])
+            for item in data
+        }
+
+    async def _post(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        """向神奇海螺 API 提交文本并按需重试，成功时返回解析后的字典列表，失败或格式异常返回 None"""
+        payload = {"text": text}
         headers = {"Content-Type": "application/json"}
-        client_timeout = aiohttp.ClientTimeout(total=self.timeout)
+        session = await self._get_session()
 
         for attempt in range(1, self.max_retries + 1):
             try:
-                async with aiohttp.ClientSession(timeout=client_timeout) as session:
-                    async with session.post(self.api_url, json=payload, headers=headers) as response:
-                        if response.status != 200:
-                            logger.warning("API 请求失败，状态码: %s", response.status)
-                            continue
-
-                        data = await response.json()
-                        if not data:
-                            return []
+                async with session.post(
+                    self.api_url, json=payload, headers=headers, timeout=self._request_timeout
+                ) as response:
+                    if response.status == 200:
+                        body = await response.read()
+                        data = (_json_loads(body) or []) if body.strip() else []
+                        if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+                            return data
+                        # 格式不符按请求失败处理，不写入未命中缓存
+                        logger.warning("API 返回格式异常: %s", type(data).__name__)
+                        return None
 
-                        first_item = data[0]
-                        translations = first_item.get("trans") or []
-                        return [str(item) for item in translations]
+                    logger.warning("API 请求失败，状态码: %s", response.status)
+                    # 除 429 外的 4xx 重试也不会成功，直接放弃
+                    if 400 <= response.status < 500 and response.status != 429:
+                        return None
 
             except asyncio.TimeoutError:
                 logger.warning("API 请求超时，第 %s/%s 次尝试", attempt, self.max_retries)
@@ -79,20 +263,24 @@ class NbnhhshTranslator(BaseTranslator):
                 logger.exception("API 请求异常，第 %s/%s 次尝试: %s", attempt, self.max_retries, exc)
 
             if attempt < self.max_retries:
-                await asyncio.sleep(attempt)  # 简单的递增退避
+                # 带抖动的指数退避，上限 8 秒
+                await asyncio.sleep(min(2 ** (attempt - 1), 8) * (0.5 + random.random()))
 
-        return []
+        return None
 
     @staticmethod
     def is_abbreviation_query(query: str) -> bool:
         """判断查询是否匹配缩写询问模式"""
-        pattern = r"^([a-z0-9]{2,})(?:是什么|是啥)$"
-        return bool(re.match(pattern, query.lower().strip()))
+        # 至少两位缩写加“是啥”，更短的输入无需 lower/strip
+        if len(query) < 4:
+            return False
+        return _ABBR_RE.match(query.lower().strip()) is not None
 
     @staticmethod
     def extract_abbreviation(query: str) -> Optional[str]:
         """从查询语句中提取缩写"""
-        pattern = r"^([a-z0-9]{2,})(?:是什么|是啥)$"
-        match = re.match(pattern, query.lower().strip())
+        if len(query) < 4:
+            return None
+        match = _ABBR_RE.match(query.lower().strip())
         return match.group(1) if match else None
 
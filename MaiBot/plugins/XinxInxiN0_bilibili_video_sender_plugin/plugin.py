@@ -1,28 +1,51 @@
 from __future__ import annotations
 
 import asyncio
+import copy
+import functools
 import hashlib
 import json
+import logging
+import operator
 import os
 import platform
 import re
 import tempfile
 import time
 import urllib.parse
-import urllib.request
 import subprocess
 import shutil
+import sys
+import threading
 import aiohttp
 import base64
 
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple, Type
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data.decode("utf-8", errors="ignore"))
+
 from src.common.logger import get_logger
+from src.common.tcp_connector import close_session_on_loop
 
 # 为模块级独立函数创建logger
 _utils_logger = get_logger("plugin.bilibili_video_sender.utils")
 
+# Windows 盘符路径，如 E:\path\to\file
+_DRIVE_RE = re.compile(r'^([a-zA-Z]):(.*)$')
+# 视频链接路径中的 av 号
+_AV_RE = re.compile(r"/video/av(?P<aid>\d+)")
+# 文件名中不允许出现的字符
+_UNSAFE_FILENAME_RE = re.compile(r"[\\/:*?\"<>|]+")
 
+
+@functools.lru_cache(maxsize=512)
 def convert_windows_to_wsl_path(windows_path: str) -> str:
     """将Windows路径转换为WSL路径
     
@@ -42,9 +65,10 @@ def convert_windows_to_wsl_path(windows_path: str) -> str:
             
         # 如果wslpath命令失败，手动转换路径
         # 移除盘符中的冒号，将反斜杠转换为正斜杠
-        if re.match(r'^[a-zA-Z]:', windows_path):
-            drive = windows_path[0].lower()
-            path = windows_path[2:].replace('\\', '/')
+        match = _DRIVE_RE.match(windows_path)
+        if match:
+            drive = match.group(1).lower()
+            path = match.group(2).replace('\\', '/')
             return f"/mnt/{drive}/{path}"
         return windows_path
     except Exception:
@@ -68,6 +92,11 @@ from src.plugin_system.apis.plugin_register_api import register_plugin
 from src.plugin_system.apis import send_api, llm_api
 
 
+# FFmpeg能力探测结果缓存，键为 "路径:mtime_ns:大小"，替换FFmpeg后自动失效
+_CAPS_CACHE: Dict[str, Dict[str, Any]] = {}
+_CAPS_LOCK = threading.Lock()
+
+
 class FFmpegManager:
     """跨平台FFmpeg管理器"""
     
@@ -77,6 +106,54 @@ class FFmpegManager:
         self.plugin_dir = os.path.dirname(os.path.abspath(__file__))
         self.system = platform.system().lower()
         self.ffmpeg_dir = os.path.join(self.plugin_dir, 'ffmpeg')
+        self.caps_cache_file = os.path.join(self.ffmpeg_dir, '.caps_cache.json')
+        self._caps_file_loaded = False
+
+    @staticmethod
+    def _caps_key(ffmpeg_path: str) -> Optional[str]:
+        """根据可执行文件的路径、修改时间和大小生成缓存键"""
+        try:
+            st = os.stat(ffmpeg_path)
+        except OSError:
+            return None
+        return f"{ffmpeg_path}:{st.st_mtime_ns}:{st.st_size}"
+
+    def _get_cached_caps(self, key: Optional[str], field: str) -> Optional[Any]:
+        """读取缓存的探测结果，内存未命中时加载一次磁盘缓存"""
+        if key is None:
+            return None
+        with _CAPS_LOCK:
+            if key not in _CAPS_CACHE and not self._caps_file_loaded:
+                self._caps_file_loaded = True
+                try:
+                    with open(self.caps_cache_file, 'r', encoding='utf-8') as f:
+                        disk_cache = json.load(f)
+                    if isinstance(disk_cache, dict):
+                        for k, v in disk_cache.items():
+                            _CAPS_CACHE.setdefault(k, v)
+                except (OSError, ValueError):
+                    pass
+            entry = _CAPS_CACHE.get(key)
+            if entry is None or field not in entry:
+                return None
+            return copy.deepcopy(entry[field])
+
+    def _set_cached_caps(self, key: Optional[str], field: str, value: Any) -> None:
+        """保存探测结果到内存，并原子写入磁盘缓存"""
+        if key is None:
+            return
+        with _CAPS_LOCK:
+            _CAPS_CACHE.setdefault(key, {})[field] = copy.deepcopy(value)
+            try:
+                os.makedirs(self.ffmpeg_dir, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    'w', encoding='utf-8', dir=self.ffmpeg_dir, suffix='.tmp', delete=False
+                ) as f:
+                    json.dump(_CAPS_CACHE, f, ensure_ascii=False)
+                    tmp_path = f.name
+                os.replace(tmp_path, self.caps_cache_file)
+            except OSError as e:
+                self._logger.debug(f"Failed to write FFmpeg caps cache: {e}")
 
     def get_ffmpeg_path(self) -> Optional[str]:
         """获取ffmpeg可执行文件路径"""
@@ -88,44 +165,72 @@ class FFmpegManager:
 
     def _get_executable_path(self, executable_name: str) -> Optional[str]:
         """根据操作系统获取可执行文件路径"""
+        return self._resolve_executable(self.system, self.ffmpeg_dir, executable_name)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _resolve_executable(system: str, ffmpeg_dir: str, executable_name: str) -> Optional[str]:
+        """查找可执行文件，结果按 (系统, 目录, 名称) 缓存，避免重复的文件系统查询"""
+        logger = FFmpegManager._logger
         # 确定可执行文件名称和路径
-        if self.system == "windows":
-            bin_dir = os.path.join(self.ffmpeg_dir, 'bin')
+        if system == "windows":
+            bin_dir = os.path.join(ffmpeg_dir, 'bin')
             executable_path = os.path.join(bin_dir, f'{executable_name}.exe')
-        elif self.system in ["linux", "darwin"]:  # Linux 和 macOS
+        elif system in ["linux", "darwin"]:  # Linux 和 macOS
             # 优先检查平台特定的目录
-            platform_bin_dir = os.path.join(self.ffmpeg_dir, 'bin', self.system)
+            platform_bin_dir = os.path.join(ffmpeg_dir, 'bin', system)
             executable_path = os.path.join(platform_bin_dir, executable_name)
 
             # 如果平台特定目录不存在，检查通用bin目录
             if not os.path.exists(executable_path):
-                bin_dir = os.path.join(self.ffmpeg_dir, 'bin')
+                bin_dir = os.path.join(ffmpeg_dir, 'bin')
                 executable_path = os.path.join(bin_dir, executable_name)
         else:
-            self._logger.warning(f"不支持的操作系统: {self.system}")
+            logger.warning(f"不支持的操作系统: {system}")
             return None
 
         # 检查插件内置的ffmpeg
         if os.path.exists(executable_path):
-            self._logger.debug(f"Found bundled {executable_name}: {executable_path}")
+            logger.debug(f"Found bundled {executable_name}: {executable_path}")
             return executable_path
 
         # 检查系统PATH中的ffmpeg
         system_executable = shutil.which(executable_name)
         if system_executable:
-            self._logger.debug(f"Found system {executable_name}: {system_executable}")
+            logger.debug(f"Found system {executable_name}: {system_executable}")
             return system_executable
 
-        self._logger.warning(f"未找到{executable_name}可执行文件")
+        logger.warning(f"未找到{executable_name}可执行文件")
         return None
 
+    @staticmethod
+    def _run_sync(coro: Any) -> Any:
+        """在没有事件循环的线程（如线程池）中同步执行探测协程"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # 在事件循环线程内同步等待探测会阻塞整个循环，应改用异步版本
+        coro.close()
+        raise RuntimeError("同步探测接口不能在事件循环线程中调用，请使用对应的异步方法")
+
     def check_hardware_encoders(self) -> Dict[str, Any]:
-        """检测可用的硬件编码器"""
+        """检测可用的硬件编码器（同步入口，仅限线程池中调用）"""
+        return self._run_sync(self.check_hardware_encoders_async())
+
+    async def check_hardware_encoders_async(self) -> Dict[str, Any]:
+        """检测可用的硬件编码器，各编码器的测试并发执行"""
         ffmpeg_path = self.get_ffmpeg_path()
         if not ffmpeg_path:
             return {"available_encoders": [], "recommended_encoder": "libx264"}
+
+        caps_key = self._caps_key(ffmpeg_path)
+        cached = self._get_cached_caps(caps_key, "hardware_acceleration")
+        if cached is not None:
+            return cached
         
         available_encoders = []
+        probe_ok = False
         
         # 定义要检测的硬件编码器列表（按优先级排序）
         encoders_to_check = [
@@ -148,23 +253,31 @@ class FFmpegManager:
         
         try:
             # 获取所有可用的编码器
-            cmd = [ffmpeg_path, '-encoders']
-            process = subprocess.run(cmd, capture_output=True, text=False, timeout=15)
-            
-            if process.returncode == 0:
-                encoders_output = process.stdout.decode('utf-8', errors='replace')
+            returncode, stdout, stderr = await self._run([ffmpeg_path, '-encoders'], timeout=15)
+            
+            if returncode == 0:
+                probe_ok = True
+                encoders_output = stdout.decode('utf-8', errors='replace')
+                # 每行形如 " V....D h264_nvenc   NVIDIA NVENC H.264 encoder"，取第二列作为编码器名
+                encoder_names = {
+                    parts[1]
+                    for parts in (line.split(None, 2) for line in encoders_output.splitlines())
+                    if len(parts) >= 2
+                }
                 
-                # 检查每个硬件编码器是否可用
-                for encoder in encoders_to_check:
-                    if encoder["name"] in encoders_output:
-                        # 进一步测试编码器是否真正可用
-                        if self._test_encoder(ffmpeg_path, encoder["name"]):
-                            available_encoders.append(encoder)
-                            self._logger.debug(f"Found available encoder: {encoder['description']}")
-                        else:
-                            self._logger.debug(f"Encoder {encoder['name']} exists but unavailable")
+                # 先按编码器列表过滤，再并发测试编码器是否真正可用
+                candidates = [e for e in encoders_to_check if e["name"] in encoder_names]
+                test_results = await asyncio.gather(
+                    *(self._test_encoder(ffmpeg_path, e["name"]) for e in candidates)
+                )
+                for encoder, usable in zip(candidates, test_results, strict=True):
+                    if usable:
+                        available_encoders.append(encoder)
+                        self._logger.debug(f"Found available encoder: {encoder['description']}")
+                    else:
+                        self._logger.debug(f"Encoder {encoder['name']} exists but unavailable")
             else:
-                stderr_text = process.stderr.decode('utf-8', errors='replace') if process.stderr else ''
+                stderr_text = stderr.decode('utf-8', errors='replace') if stderr else ''
                 self._logger.warning(f"获取编码器列表失败: {stderr_text}")
                 
         except Exception as e:
@@ -180,28 +293,111 @@ class FFmpegManager:
         }
         
         self._logger.debug(f"Hardware encoder detection complete: {len(available_encoders)} available, recommend: {recommended_encoder}")
+        # 探测失败时不缓存，下次重新检测
+        if probe_ok:
+            self._set_cached_caps(caps_key, "hardware_acceleration", result)
         return result
     
-    def _test_encoder(self, ffmpeg_path: str, encoder_name: str) -> bool:
+    @staticmethod
+    async def _run(cmd: List[str], timeout: float) -> Tuple[int, bytes, bytes]:
+        """异步执行命令并收集输出，超时后终止进程并抛出 asyncio.TimeoutError"""
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return process.returncode, stdout, stderr
+
+    async def _test_encoder(self, ffmpeg_path: str, encoder_name: str) -> bool:
         """测试编码器是否真正可用"""
         try:
             # 创建一个1秒的测试视频来验证编码器
-            cmd = [
+            process = await asyncio.create_subprocess_exec(
                 ffmpeg_path,
                 '-f', 'lavfi',
                 '-i', 'testsrc=duration=1:size=320x240:rate=1',
                 '-c:v', encoder_name,
                 '-t', '1',
                 '-f', 'null',
-                '-'
-            ]
-            
-            process = subprocess.run(cmd, capture_output=True, text=False, timeout=10)
+                '-',
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            try:
+                await asyncio.wait_for(process.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return False
             return process.returncode == 0
             
         except Exception:
             return False
     
+    def check_hardware_decoders(self) -> List[str]:
+        """检测FFmpeg支持的硬件解码加速方式（同步入口，仅限线程池中调用）"""
+        return self._run_sync(self.check_hardware_decoders_async())
+
+    async def check_hardware_decoders_async(self) -> List[str]:
+        """检测FFmpeg支持的硬件解码加速方式（ffmpeg -hwaccels）"""
+        ffmpeg_path = self.get_ffmpeg_path()
+        if not ffmpeg_path:
+            return []
+
+        caps_key = self._caps_key(ffmpeg_path)
+        cached = self._get_cached_caps(caps_key, "hwaccels")
+        if cached is not None:
+            return cached
+
+        try:
+            returncode, stdout, stderr = await self._run([ffmpeg_path, '-hide_banner', '-hwaccels'], timeout=10)
+        except Exception as e:
+            self._logger.warning(f"检测硬件解码器时发生错误: {e}")
+            return []
+
+        if returncode != 0:
+            stderr_text = stderr.decode('utf-8', errors='replace') if stderr else ''
+            self._logger.warning(f"获取硬件解码列表失败: {stderr_text}")
+            return []
+
+        # 首行为 "Hardware acceleration methods:"，其后每行一个名称
+        output = stdout.decode('utf-8', errors='replace')
+        hwaccels = [line.strip() for line in output.splitlines() if line.strip() and ':' not in line]
+        self._logger.debug(f"Hardware decoders: {hwaccels}")
+        self._set_cached_caps(caps_key, "hwaccels", hwaccels)
+        return hwaccels
+
+    def get_recommended_hwaccel(self, encoder_name: str) -> Optional[str]:
+        """根据编码器选择同一硬件上的解码加速方式，不支持时返回None"""
+        if "nvenc" in encoder_name:
+            hwaccel = "cuda"
+        elif "qsv" in encoder_name:
+            hwaccel = "qsv"
+        elif "amf" in encoder_name:
+            hwaccel = "d3d11va" if self.system == "windows" else "vaapi"
+        elif "videotoolbox" in encoder_name:
+            hwaccel = "videotoolbox"
+        else:
+            return None
+        return hwaccel if hwaccel in self.check_hardware_decoders() else None
+
+    def get_hwaccel_args(self, encoder_name: str) -> List[str]:
+        """返回放在 -i 之前的硬件解码参数"""
+        hwaccel = self.get_recommended_hwaccel(encoder_name)
+        if not hwaccel:
+            return []
+        args = ['-hwaccel', hwaccel]
+        # NVENC 可直接编码显存中的帧，省去解码后拷回内存
+        if hwaccel == "cuda":
+            args.extend(['-hwaccel_output_format', 'cuda'])
+        return args
+
     def _get_recommended_encoder(self, available_encoders: List[Dict[str, Any]]) -> str:
         """根据可用编码器选择推荐的编码器"""
         if not available_encoders:
@@ -236,20 +432,27 @@ class FFmpegManager:
             result["ffmpeg_available"] = True
             result["ffmpeg_path"] = ffmpeg_path
 
-            try:
-                # 获取ffmpeg版本信息
-                cmd = [ffmpeg_path, '-version']
-                process = subprocess.run(cmd, capture_output=True, text=False, timeout=10)
-                if process.returncode == 0:
-                    stdout_text = process.stdout.decode('utf-8', errors='replace')
-                    version_line = stdout_text.split('\n')[0] if stdout_text else ""
-                    result["ffmpeg_version"] = version_line
-                    self._logger.debug(f"FFmpeg version: {version_line}")
-                    
-                    # 检测硬件编码器
-                    result["hardware_acceleration"] = self.check_hardware_encoders()
-            except Exception as e:
-                self._logger.warning(f"Failed to get FFmpeg version: {e}")
+            caps_key = self._caps_key(ffmpeg_path)
+            version_line = self._get_cached_caps(caps_key, "ffmpeg_version")
+            if version_line is not None:
+                result["ffmpeg_version"] = version_line
+                result["hardware_acceleration"] = self.check_hardware_encoders()
+            else:
+                try:
+                    # 获取ffmpeg版本信息
+                    cmd = [ffmpeg_path, '-version']
+                    process = subprocess.run(cmd, capture_output=True, text=False, timeout=10)
+                    if process.returncode == 0:
+                        stdout_text = process.stdout.decode('utf-8', errors='replace')
+                        version_line = stdout_text.split('\n')[0] if stdout_text else ""
+                        result["ffmpeg_version"] = version_line
+                        self._logger.debug(f"FFmpeg version: {version_line}")
+                        self._set_cached_caps(caps_key, "ffmpeg_version", version_line)
+
+                        # 检测硬件编码器
+                        result["hardware_acceleration"] = self.check_hardware_encoders()
+                except Exception as e:
+                    self._logger.warning(f"Failed to get FFmpeg version: {e}")
 
         # 检查ffprobe
         ffprobe_path = self.get_ffprobe_path()
@@ -264,10 +467,18 @@ class FFmpegManager:
 # 全局FFmpeg管理器实例
 _ffmpeg_manager = FFmpegManager()
 
+# 流下载的分块大小，视频动辄数百MB，大块读写可减少循环次数
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 
 
 class ProgressBar:
     """进度条显示类"""
+
+    __slots__ = (
+        "total_size", "description", "bar_length", "current_size", "last_update",
+        "_interval_ns", "_bar_full", "_bar_empty", "_has_total", "_total_mb",
+    )
     
     def __init__(self, total_size: int, description: str = "下载进度", bar_length: int = 30):
         self.total_size = total_size
@@ -275,53 +486,67 @@ class ProgressBar:
         self.bar_length = bar_length
         self.current_size = 0
         self.last_update = 0
-        self.update_interval = 0.1  # 100ms更新一次，避免过于频繁
-        
-    def update(self, downloaded: int):
+        self._interval_ns = 100_000_000  # 100ms更新一次，避免过于频繁
+        # 预先构建满/空进度条，更新时只需切片拼接
+        self._bar_full = '█' * bar_length
+        self._bar_empty = '░' * bar_length
+        self._has_total = total_size > 0
+        self._total_mb = total_size / (1024 * 1024) if self._has_total else 0
+        
+    def update(self, downloaded: int, force: bool = False):
         """更新进度"""
         self.current_size = downloaded
-        current_time = time.time()
+        now = time.monotonic_ns()
         
         # 控制更新频率，避免过于频繁的日志输出
-        if current_time - self.last_update < self.update_interval:
+        if not force and now - self.last_update < self._interval_ns:
             return
             
-        self.last_update = current_time
+        self.last_update = now
         
-        # 计算进度百分比
-        if self.total_size > 0:
+        # 计算进度百分比和进度条填充长度
+        if self._has_total:
             percentage = (downloaded / self.total_size) * 100
+            filled_length = min(self.bar_length * downloaded // self.total_size, self.bar_length)
         else:
             percentage = 0
-            
-        # 计算进度条填充长度
-        filled_length = int(self.bar_length * downloaded // self.total_size) if self.total_size > 0 else 0
+            filled_length = 0
         
         # 构建进度条
-        bar = '█' * filled_length + '░' * (self.bar_length - filled_length)
-        
-        # 格式化文件大小显示
-        downloaded_mb = downloaded / (1024 * 1024)
-        total_mb = self.total_size / (1024 * 1024) if self.total_size > 0 else 0
+        bar = self._bar_full[:filled_length] + self._bar_empty[filled_length:]
         
         # 输出进度条
-        print(f"\r{self.description}: [{bar}] {percentage:5.1f}% ({downloaded_mb:6.1f}MB/{total_mb:6.1f}MB)", end='', flush=True)
+        downloaded_mb = downloaded / (1024 * 1024)
+        sys.stdout.write(f"\r{self.description}: [{bar}] {percentage:5.1f}% ({downloaded_mb:6.1f}MB/{self._total_mb:6.1f}MB)")
+        sys.stdout.flush()
         
     def finish(self):
         """完成进度条显示"""
         # 确保显示100%
-        self.update(self.total_size)
+        self.update(self.total_size, force=True)
         print()  # 换行
 
 
+# 清晰度代码 qn 对应的名称
+_QN_NAMES: Dict[int, str] = {
+    6: "240P", 16: "360P", 32: "480P", 64: "720P", 80: "1080P",
+    112: "1080P+", 116: "1080P60", 120: "4K", 125: "HDR", 126: "杜比视界",
+}
+
+
+def _stream_bandwidth(stream: Dict[str, Any]) -> int:
+    """DASH 流的带宽，用于挑选最高质量的流"""
+    return stream.get("bandwidth", 0)
+
+
+@dataclass(slots=True)
 class BilibiliVideoInfo:
     """基础视频信息。"""
-    
-    def __init__(self, aid: int, cid: int, title: str, bvid: Optional[str] = None):
-        self.aid = aid
-        self.cid = cid
-        self.title = title
-        self.bvid = bvid
+
+    aid: int
+    cid: int
+    title: str
+    bvid: Optional[str] = None
 
 
 class BilibiliParser:
@@ -341,28 +566,64 @@ class BilibiliParser:
     )
     B23_SHORT_PATTERN = re.compile(r"https?://b23\.tv/[\w]+", re.IGNORECASE)
 
+    # 共享的 HTTP 会话，复用连接池和 TLS 连接
+    _http: Optional[aiohttp.ClientSession] = None
+    _http_loop: Optional[asyncio.AbstractEventLoop] = None
+    _HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15)
+    _DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=60)
+    # 限制同时进行的流下载数量，避免对B站CDN请求过多；与会话一同按事件循环创建
+    _download_semaphore: Optional[asyncio.Semaphore] = None
+
+    # bvid -> (aid, cid)，再次解析同一视频时可与视频信息请求并发获取播放地址
+    _cid_cache: Dict[str, Tuple[int, int]] = {}
+    _CID_CACHE_SIZE = 256
+
+    @classmethod
+    def _get_http(cls) -> aiohttp.ClientSession:
+        """获取共享会话，已关闭或属于其他事件循环时重新创建"""
+        loop = asyncio.get_running_loop()
+        if cls._http is None or cls._http.closed or cls._http_loop is not loop:
+            close_session_on_loop(cls._http, cls._http_loop)
+            cls._http = aiohttp.ClientSession(
+                headers={
+                    "User-Agent": cls.USER_AGENT,
+                    "Referer": "https://www.bilibili.com/",
+                },
+                # 消息间隔通常较长，连接保持 60 秒以便下一条链接复用已建立的 TLS 连接
+                connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300, keepalive_timeout=60),
+                read_bufsize=_DOWNLOAD_CHUNK_SIZE,
+            )
+            cls._download_semaphore = asyncio.Semaphore(4)
+            cls._http_loop = loop
+        return cls._http
+
+    @classmethod
+    async def close(cls) -> None:
+        """关闭共享会话"""
+        session, cls._http, cls._http_loop = cls._http, None, None
+        if session is not None and not session.closed:
+            await session.close()
+
     @staticmethod
-    def _build_request(url: str, headers: Optional[Dict[str, str]] = None) -> urllib.request.Request:
-        default_headers = {
-            "User-Agent": BilibiliParser.USER_AGENT,
-            "Referer": "https://www.bilibili.com/",
-        }
-        if headers:
-            default_headers.update(headers)
-        return urllib.request.Request(url, headers=default_headers)
+    async def _fetch_json(url: str) -> Dict[str, Any]:
+        session = BilibiliParser._get_http()
+        async with session.get(url, timeout=BilibiliParser._HTTP_TIMEOUT) as resp:
+            # 风控拦截时返回的 412/5xx 是 HTML 页面，先按状态码报错而不是当作 JSON 解析
+            resp.raise_for_status()
+            return _json_loads(await resp.read())
 
     @staticmethod
-    def _fetch_json(url: str) -> Dict[str, Any]:
-        req = BilibiliParser._build_request(url)
-        with urllib.request.urlopen(req, timeout=15) as resp:  # nosec - trusted public API
-            data = resp.read()
-        return json.loads(data.decode("utf-8", errors="ignore"))
+    async def _follow_redirect(url: str) -> str:
+        session = BilibiliParser._get_http()
+        async with session.get(url, allow_redirects=True, timeout=BilibiliParser._HTTP_TIMEOUT) as resp:
+            return str(resp.url)
 
     @staticmethod
-    def _follow_redirect(url: str) -> str:
-        req = BilibiliParser._build_request(url)
-        with urllib.request.urlopen(req, timeout=15) as resp:  # nosec - trusted public short URL
-            return resp.geturl()
+    def _session_hash(buvid3: str) -> str:
+        """计算 playurl 的 session 参数：md5(buvid3 + 当前毫秒时间戳)"""
+        h = hashlib.md5(buvid3.encode("utf-8"))
+        h.update(str(time.time_ns() // 1_000_000).encode("ascii"))
+        return h.hexdigest()
 
     @staticmethod
     def _extract_bvid(url: str) -> Optional[str]:
@@ -376,12 +637,12 @@ class BilibiliParser:
         return None
 
     @staticmethod
-    def find_first_bilibili_url(text: str) -> Optional[str]:
+    async def find_first_bilibili_url(text: str) -> Optional[str]:
         # 先匹配 b23.tv 短链
         short = BilibiliParser.B23_SHORT_PATTERN.search(text)
         if short:
             try:
-                return BilibiliParser._follow_redirect(short.group(0))
+                return await BilibiliParser._follow_redirect(short.group(0))
             except Exception:
                 # 回退为原短链
                 return short.group(0)
@@ -393,23 +654,24 @@ class BilibiliParser:
         return None
 
     @staticmethod
-    def get_view_info_by_url(url: str) -> Optional[BilibiliVideoInfo]:
+    async def get_view_info_by_url(url: str) -> Optional[BilibiliVideoInfo]:
         # 优先解析 BV 号
         bvid = BilibiliParser._extract_bvid(url)
 
         query: str
         if bvid:
-            query = f"bvid={urllib.parse.quote(bvid)}"
+            # BV 号由 VIDEO_URL_PATTERN 匹配得到，无需转义；其余字符由 aiohttp 统一编码
+            query = f"bvid={bvid}"
         else:
             # 兜底：尝试从路径中提取 av 号
-            m = re.search(r"/video/av(?P<aid>\d+)", url)
+            m = _AV_RE.search(url)
             if not m:
                 return None
             aid = m.group("aid")
             query = f"aid={aid}"
 
         api = f"https://api.bilibili.com/x/web-interface/view?{query}"
-        payload = BilibiliParser._fetch_json(api)
+        payload = await BilibiliParser._fetch_json(api)
         if payload.get("code") != 0:
             return None
 
@@ -419,15 +681,75 @@ class BilibiliParser:
             return None
 
         first_page = pages[0]
-        return BilibiliVideoInfo(
+        info = BilibiliVideoInfo(
             aid=int(data.get("aid")),
             cid=int(first_page.get("cid")),
             title=str(data.get("title", "")),
             bvid=str(data.get("bvid", "")) or None,
         )
+        if bvid:
+            cid_cache = BilibiliParser._cid_cache
+            cid_cache.pop(bvid, None)
+            if len(cid_cache) >= BilibiliParser._CID_CACHE_SIZE:
+                cid_cache.pop(next(iter(cid_cache)))
+            cid_cache[bvid] = (info.aid, info.cid)
+        return info
+
+    @staticmethod
+    async def get_view_and_play(
+        url: str,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[BilibiliVideoInfo, List[str], str]]:
+        """获取视频信息和播放地址，已知 cid 时两个请求并发发出"""
+        bvid = BilibiliParser._extract_bvid(url)
+        cached = BilibiliParser._cid_cache.get(bvid) if bvid else None
+        if cached:
+            aid, cid = cached
+            info, (urls, status) = await asyncio.gather(
+                BilibiliParser.get_view_info_by_url(url),
+                BilibiliParser.get_play_urls(aid, cid, options),
+            )
+            if info is None:
+                return None
+            if (info.aid, info.cid) == (aid, cid):
+                return info, urls, status
+            # 缓存的 cid 已失效，按最新的视频信息重新获取
+        else:
+            info = await BilibiliParser.get_view_info_by_url(url)
+            if info is None:
+                return None
+
+        urls, status = await BilibiliParser.get_play_urls(info.aid, info.cid, options)
+        return info, urls, status
+
+    @staticmethod
+    async def download_stream(url: str, path: str, headers: Dict[str, str], description: str) -> None:
+        """下载单个媒体流到文件"""
+        session = BilibiliParser._get_http()
+        async with BilibiliParser._download_semaphore:
+            async with session.get(url, headers=headers, timeout=BilibiliParser._DOWNLOAD_TIMEOUT) as resp:
+                resp.raise_for_status()
+                # 获取文件总大小（如果可用）
+                total_size = int(resp.headers.get('content-length') or 0)
+
+                # 创建进度条
+                progress_bar = ProgressBar(total_size, description, 30)
+
+                # 文件写入与进度条输出都会阻塞，放到线程中执行
+                f = await asyncio.to_thread(open, path, "wb")
+                try:
+                    downloaded = 0
+                    async for chunk in resp.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                        downloaded += len(chunk)
+                        await asyncio.to_thread(_write_chunk, f, chunk, progress_bar, downloaded)
+                finally:
+                    await asyncio.to_thread(f.close)
+
+                # 完成进度条显示
+                await asyncio.to_thread(progress_bar.finish)
 
     @staticmethod
-    def get_play_urls(
+    async def get_play_urls(
         aid: int,
         cid: int,
         options: Optional[Dict[str, Any]] = None,
@@ -464,19 +786,7 @@ class BilibiliParser:
                 qn = 32  # 未登录默认480P
         else:
             # 检查清晰度权限
-            qn_info = {
-                6: "240P",
-                16: "360P", 
-                32: "480P",
-                64: "720P",
-                80: "1080P",
-                112: "1080P+",
-                116: "1080P60",
-                120: "4K",
-                125: "HDR",
-                126: "杜比视界"
-            }
-            qn_name = qn_info.get(qn, f"未知({qn})")
+            qn_name = _QN_NAMES.get(qn, f"未知({qn})")
             
             # 清晰度权限检查
             if qn >= 64 and not has_cookie:
@@ -510,9 +820,7 @@ class BilibiliParser:
             
         if buvid3:
             # 生成 session: md5(buvid3 + 当前毫秒)
-            ms = str(int(time.time() * 1000))
-            session_hash = hashlib.md5((buvid3 + ms).encode("utf-8")).hexdigest()
-            params["session"] = session_hash
+            params["session"] = BilibiliParser._session_hash(buvid3)
             
         # 添加gaia_source参数（有Cookie时非必要）
         if not has_cookie:
@@ -523,8 +831,7 @@ class BilibiliParser:
             "https://api.bilibili.com/x/player/wbi/playurl" if use_wbi else "https://api.bilibili.com/x/player/playurl"
         )
         
-        final_params = BilibiliWbiSigner.sign_params(params) if use_wbi else params
-        query = urllib.parse.urlencode(final_params)
+        query = await BilibiliWbiSigner.sign_query(params) if use_wbi else urllib.parse.urlencode(params)
         api = f"{api_base}?{query}"
 
         # 构建请求头：可带 Cookie
@@ -540,15 +847,15 @@ class BilibiliParser:
 
         # 发起请求
         try:
-            req = BilibiliParser._build_request(api, headers=headers)
-            with urllib.request.urlopen(req, timeout=15) as resp:  # nosec - trusted public API
-                data_bytes = resp.read()
+            session = BilibiliParser._get_http()
+            async with session.get(api, headers=headers, timeout=BilibiliParser._HTTP_TIMEOUT) as resp:
+                data_bytes = await resp.read()
         except Exception as e:
             BilibiliParser._logger.error(f"HTTP请求失败: {e}")
             return [], f"网络请求失败: {e}"
             
         try:
-            payload = json.loads(data_bytes.decode("utf-8", errors="ignore"))
+            payload = _json_loads(data_bytes)
         except Exception as e:
             BilibiliParser._logger.error(f"JSON解析失败: {e}")
             return [], "响应数据格式错误"
@@ -582,11 +889,13 @@ class BilibiliParser:
         
         videos = dash.get("video") or []
         audios = dash.get("audio") or []
+        # 逐流明细日志只在 DEBUG 级别输出，避免无谓的格式化
+        debug_enabled = BilibiliParser._logger.isEnabledFor(logging.DEBUG)
         
         BilibiliParser._logger.debug(f"找到{len(videos)}个视频流和{len(audios)}个音频流")
         
         # 记录视频流详细信息
-        if videos:
+        if debug_enabled and videos:
             BilibiliParser._logger.debug("Video stream details:")
             BilibiliParser._logger.debug(f"{'No.':<4} {'Resolution':<12} {'Codec':<25} {'Bitrate':<10} {'FPS':<10}")
             for i, video in enumerate(videos):
@@ -598,7 +907,7 @@ class BilibiliParser:
                 BilibiliParser._logger.debug(f"{i+1:<4} {width}x{height:<8} {codec:<25} {bandwidth//1000:<10}kbps {frame_rate:<10}")
         
         # 记录音频流详细信息
-        if audios:
+        if debug_enabled and audios:
             BilibiliParser._logger.debug("Audio stream details:")
             BilibiliParser._logger.debug(f"{'No.':<4} {'Codec':<25} {'Bitrate':<10}")
             for i, audio in enumerate(audios):
@@ -614,7 +923,7 @@ class BilibiliParser:
         if dolby and dolby.get("audio"):
             dolby_audios = dolby.get("audio", [])
             BilibiliParser._logger.debug(f"Found {len(dolby_audios)} Dolby audio streams")
-            if dolby_audios:
+            if debug_enabled and dolby_audios:
                 BilibiliParser._logger.debug("Dolby audio stream details:")
                 BilibiliParser._logger.debug(f"{'No.':<4} {'Codec':<25} {'Bitrate':<10}")
                 for i, audio in enumerate(dolby_audios):
@@ -626,7 +935,7 @@ class BilibiliParser:
         if flac and flac.get("audio"):
             flac_audios = [flac.get("audio")]
             BilibiliParser._logger.debug(f"Found {len(flac_audios)} FLAC audio stream")
-            if flac_audios:
+            if debug_enabled and flac_audios:
                 BilibiliParser._logger.debug("FLAC audio stream details:")
                 BilibiliParser._logger.debug(f"{'No.':<4} {'Codec':<25} {'Bitrate':<10}")
                 for i, audio in enumerate(flac_audios):
@@ -644,15 +953,11 @@ class BilibiliParser:
         if not all_audios:
             BilibiliParser._logger.warning("未找到音频流")
         
-        # 参考原脚本，按照质量排序（降序）
-        videos.sort(key=lambda x: x.get("bandwidth", 0), reverse=True)
-        all_audios.sort(key=lambda x: x.get("bandwidth", 0), reverse=True)
-        
         candidates = []
         
         # 参考原脚本，选择最高质量的视频流
         if videos:
-            best_video = videos[0]
+            best_video = max(videos, key=_stream_bandwidth)
             video_url = best_video.get("baseUrl") or best_video.get("base_url")
             if video_url:
                 candidates.append(video_url.replace("http:", "https:"))
@@ -664,7 +969,7 @@ class BilibiliParser:
                 
         # 参考原脚本，选择最高质量的音频流
         if all_audios:
-            best_audio = all_audios[0]
+            best_audio = max(all_audios, key=_stream_bandwidth)
             audio_url = best_audio.get("baseUrl") or best_audio.get("base_url")
             if audio_url:
                 candidates.append(audio_url.replace("http:", "https:"))
@@ -680,7 +985,7 @@ class BilibiliParser:
         return [], "未获取到播放地址"
     
     @staticmethod
-    def get_play_urls_force_dash(
+    async def get_play_urls_force_dash(
         aid: int,
         cid: int,
         options: Optional[Dict[str, Any]] = None,
@@ -719,9 +1024,7 @@ class BilibiliParser:
         }
         
         if buvid3:
-            ms = str(int(time.time() * 1000))
-            session_hash = hashlib.md5((buvid3 + ms).encode("utf-8")).hexdigest()
-            params["session"] = session_hash
+            params["session"] = BilibiliParser._session_hash(buvid3)
             
         # 添加gaia_source参数（有Cookie时非必要）
         if not has_cookie:
@@ -731,8 +1034,7 @@ class BilibiliParser:
             "https://api.bilibili.com/x/player/wbi/playurl" if use_wbi else "https://api.bilibili.com/x/player/playurl"
         )
         
-        final_params = BilibiliWbiSigner.sign_params(params) if use_wbi else params
-        query = urllib.parse.urlencode(final_params)
+        query = await BilibiliWbiSigner.sign_query(params) if use_wbi else urllib.parse.urlencode(params)
         api = f"{api_base}?{query}"
 
         headers: Dict[str, str] = {}
@@ -744,15 +1046,15 @@ class BilibiliParser:
             headers["gaia_source"] = sessdata  # 添加 gaia_source
 
         try:
-            req = BilibiliParser._build_request(api, headers=headers)
-            with urllib.request.urlopen(req, timeout=15) as resp:  # nosec - trusted public API
-                data_bytes = resp.read()
+            session = BilibiliParser._get_http()
+            async with session.get(api, headers=headers, timeout=BilibiliParser._HTTP_TIMEOUT) as resp:
+                data_bytes = await resp.read()
         except Exception as e:
             BilibiliParser._logger.error(f"Force DASH HTTP error: {e}")
             return [], f"Force DASH network error: {e}"
             
         try:
-            payload = json.loads(data_bytes.decode("utf-8", errors="ignore"))
+            payload = _json_loads(data_bytes)
         except Exception as e:
             BilibiliParser._logger.error(f"Force DASH JSON parse error: {e}")
             return [], "Force DASH response format error"
@@ -785,11 +1087,13 @@ class BilibiliParser:
         
         videos = dash.get("video") or []
         audios = dash.get("audio") or []
+        # 逐流明细日志只在 DEBUG 级别输出，避免无谓的格式化
+        debug_enabled = BilibiliParser._logger.isEnabledFor(logging.DEBUG)
         
         BilibiliParser._logger.debug(f"Force DASH: {len(videos)} video streams, {len(audios)} audio streams")
         
         # 记录视频流详细信息（表格格式）
-        if videos:
+        if debug_enabled and videos:
             BilibiliParser._logger.debug("Force DASH video stream details:")
             BilibiliParser._logger.debug(f"{'No.':<4} {'Resolution':<12} {'Codec':<25} {'Bitrate':<10} {'FPS':<10}")
             for i, video in enumerate(videos):
@@ -801,7 +1105,7 @@ class BilibiliParser:
                 BilibiliParser._logger.debug(f"{i+1:<4} {width}x{height:<8} {codec:<25} {bandwidth//1000:<10}kbps {frame_rate:<10}")
         
         # 记录音频流详细信息（表格格式）
-        if audios:
+        if debug_enabled and audios:
             BilibiliParser._logger.debug("Force DASH audio stream details:")
             BilibiliParser._logger.debug(f"{'No.':<4} {'Codec':<25} {'Bitrate':<10}")
             for i, audio in enumerate(audios):
@@ -816,7 +1120,7 @@ class BilibiliParser:
         dolby = dash.get("dolby")
         if dolby and dolby.get("audio"):
             dolby_audios = dolby.get("audio", [])
-            if dolby_audios:
+            if debug_enabled and dolby_audios:
                 BilibiliParser._logger.debug("Force DASH Dolby audio stream details:")
                 BilibiliParser._logger.debug(f"{'No.':<4} {'Codec':<25} {'Bitrate':<10}")
                 for i, audio in enumerate(dolby_audios):
@@ -827,7 +1131,7 @@ class BilibiliParser:
         flac = dash.get("flac")
         if flac and flac.get("audio"):
             flac_audios = [flac.get("audio")]
-            if flac_audios:
+            if debug_enabled and flac_audios:
                 BilibiliParser._logger.debug("Force DASH FLAC audio stream details:")
                 BilibiliParser._logger.debug(f"{'No.':<4} {'Codec':<25} {'Bitrate':<10}")
                 for i, audio in enumerate(flac_audios):
@@ -841,15 +1145,11 @@ class BilibiliParser:
             BilibiliParser._logger.warning(f"Force DASH: missing streams - video={len(videos)}, audio={len(all_audios)}")
             return [], "Missing video or audio streams"
         
-        # 按照质量排序
-        videos.sort(key=lambda x: x.get("bandwidth", 0), reverse=True)
-        all_audios.sort(key=lambda x: x.get("bandwidth", 0), reverse=True)
-        
         candidates = []
         
         # 获取最高质量的视频和音频流
         if videos:
-            best_video = videos[0]
+            best_video = max(videos, key=_stream_bandwidth)
             video_url = best_video.get("baseUrl") or best_video.get("base_url")
             if video_url:
                 candidates.append(video_url.replace("http:", "https:"))
@@ -860,7 +1160,7 @@ class BilibiliParser:
                 BilibiliParser._logger.debug(f"Force DASH selected video: {width}x{height}, {codec}, {bandwidth//1000}kbps")
             
         if all_audios:
-            best_audio = all_audios[0]
+            best_audio = max(all_audios, key=_stream_bandwidth)
             audio_url = best_audio.get("baseUrl") or best_audio.get("base_url")
             if audio_url:
                 candidates.append(audio_url.replace("http:", "https:"))
@@ -880,80 +1180,71 @@ class BilibiliParser:
         """验证配置参数的有效性"""
         
         opts = options or {}
-        validation_result = {
-            "valid": True,
-            "warnings": [],
-            "errors": [],
-            "recommendations": []
-        }
-        
-
+        valid = True
+        warnings: List[str] = []
+        errors: List[str] = []
+        recommendations: List[str] = []
         
         # 检查Cookie配置
         sessdata = str(opts.get("sessdata", "")).strip()
         buvid3 = str(opts.get("buvid3", "")).strip()
         
         if not sessdata:
-            validation_result["warnings"].append("未配置SESSDATA，将使用游客模式")
-            validation_result["recommendations"].append("建议配置SESSDATA以获得更好的清晰度和功能")
-        else:
-            if len(sessdata) < 10:
-                validation_result["errors"].append("SESSDATA长度异常，可能配置错误")
-                validation_result["valid"] = False
+            warnings.append("未配置SESSDATA，将使用游客模式")
+            recommendations.append("建议配置SESSDATA以获得更好的清晰度和功能")
+        elif len(sessdata) < 10:
+            errors.append("SESSDATA长度异常，可能配置错误")
+            valid = False
                 
         if not buvid3:
-            validation_result["warnings"].append("未配置Buvid3，session参数生成可能失败")
-            validation_result["recommendations"].append("建议配置Buvid3以确保session参数正常生成")
-        else:
-            if len(buvid3) < 10:
-                validation_result["errors"].append("Buvid3长度异常，可能配置错误")
-                validation_result["valid"] = False
+            warnings.append("未配置Buvid3，session参数生成可能失败")
+            recommendations.append("建议配置Buvid3以确保session参数正常生成")
+        elif len(buvid3) < 10:
+            errors.append("Buvid3长度异常，可能配置错误")
+            valid = False
 
         
         # 检查清晰度配置（使用硬编码值）
         qn = 0  # 硬编码值
         if qn > 0:
-            qn_info = {
-                6: "240P", 16: "360P", 32: "480P", 64: "720P", 80: "1080P",
-                112: "1080P+", 116: "1080P60", 120: "4K", 125: "HDR", 126: "杜比视界"
-            }
-            qn_name = qn_info.get(qn, f"未知({qn})")
+            qn_name = _QN_NAMES.get(qn, f"未知({qn})")
             
             if qn >= 64 and not sessdata:
-                validation_result["warnings"].append(f"请求{qn_name}清晰度但未配置Cookie，可能失败")
+                warnings.append(f"请求{qn_name}清晰度但未配置Cookie，可能失败")
             if qn >= 80 and not sessdata:
-                validation_result["warnings"].append(f"请求{qn_name}清晰度需要大会员账号")
+                warnings.append(f"请求{qn_name}清晰度需要大会员账号")
             if qn >= 116 and not sessdata:
-                validation_result["warnings"].append(f"请求{qn_name}高帧率需要大会员账号")
+                warnings.append(f"请求{qn_name}高帧率需要大会员账号")
             if qn >= 125 and not sessdata:
-                validation_result["warnings"].append(f"请求{qn_name}需要大会员账号")
+                warnings.append(f"请求{qn_name}需要大会员账号")
                 
             BilibiliParser._logger.info(f"清晰度配置: {qn_name} (qn={qn})")
         
         # 检查其他配置（使用硬编码值）
-        fnval = 4048  # 硬编码值
-            
         platform = "pc"  # 硬编码值
-        if platform not in ["pc", "html5"]:
-            validation_result["warnings"].append(f"platform值{platform}不是标准值")
+        if platform not in ("pc", "html5"):
+            warnings.append(f"platform值{platform}不是标准值")
             
         # 记录验证结果
-        if validation_result["warnings"]:
-            BilibiliParser._logger.debug(f"Config warnings: {validation_result['warnings']}")
-        if validation_result["errors"]:
-            BilibiliParser._logger.error(f"Config errors: {validation_result['errors']}")
-        if validation_result["recommendations"]:
-            BilibiliParser._logger.debug(f"Config suggestions: {validation_result['recommendations']}")
-            
-        BilibiliParser._logger.debug(f"Config validation: {'pass' if validation_result['valid'] else 'fail'}")
-        return validation_result
+        if warnings:
+            BilibiliParser._logger.debug(f"Config warnings: {warnings}")
+        if errors:
+            BilibiliParser._logger.error(f"Config errors: {errors}")
+        if recommendations:
+            BilibiliParser._logger.debug(f"Config suggestions: {recommendations}")
+            
+        BilibiliParser._logger.debug(f"Config validation: {'pass' if valid else 'fail'}")
+        return {
+            "valid": valid,
+            "warnings": warnings,
+            "errors": errors,
+            "recommendations": recommendations,
+        }
 
     @staticmethod
     def get_video_duration(video_path: str) -> Optional[float]:
         """获取视频时长（秒）"""
         try:
-            import subprocess
-
             # 使用跨平台FFmpeg管理器获取ffprobe路径
             ffprobe_path = _ffmpeg_manager.get_ffprobe_path()
 
@@ -961,37 +1252,68 @@ class BilibiliParser:
                 BilibiliParser._logger.warning("未找到ffprobe，无法获取视频时长")
                 return None
 
-            # 使用ffprobe获取视频时长
-            cmd = [ffprobe_path, '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1', video_path]
-            BilibiliParser._logger.debug(f"Running ffprobe: {' '.join(cmd)}")
-
-            # 使用正确的编码设置来避免跨平台编码问题
-            result = subprocess.run(cmd, capture_output=True, text=False)
-
-            BilibiliParser._logger.debug(f"ffprobe return code: {result.returncode}")
-            if result.stdout:
-                stdout_text = result.stdout.decode('utf-8', errors='replace').strip()
-                BilibiliParser._logger.debug(f"ffprobe output: {stdout_text}")
-            if result.stderr:
-                stderr_text = result.stderr.decode('utf-8', errors='replace').strip()
-                BilibiliParser._logger.debug(f"ffprobe stderr: {stderr_text}")
+            # 以路径、修改时间和大小作为缓存键，文件变化后自动重新探测
+            st = os.stat(video_path)
+            return BilibiliParser._probe_duration(ffprobe_path, video_path, st.st_mtime_ns, st.st_size)
+        except Exception as e:
+            BilibiliParser._logger.error(f"Error getting video duration: {e}")
+            return None
 
-            if result.returncode == 0:
-                duration_str = result.stdout.decode('utf-8', errors='replace').strip()
-                try:
-                    duration = float(duration_str)
-                    BilibiliParser._logger.debug(f"Video duration: {duration}s")
-                    return duration
-                except ValueError:
-                    BilibiliParser._logger.warning(f"Failed to parse duration: '{duration_str}'")
-                    return None
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _probe_duration(ffprobe_path: str, video_path: str, mtime_ns: int, size: int) -> Optional[float]:
+        """调用ffprobe获取时长，同一文件只探测一次"""
+        try:
+            # 先只读容器头部，mp4 的时长通常直接记录在头部，无需分析码流
+            fast_args = [
+                '-select_streams', 'v:0',
+                '-show_entries', 'format=duration:stream=duration',
+                '-probesize', '32k', '-analyzeduration', '0',
+            ]
+            duration = BilibiliParser._run_duration_probe(ffprobe_path, video_path, fast_args)
+            if duration is None:
+                # 头部没有时长信息时回退到完整探测
+                duration = BilibiliParser._run_duration_probe(
+                    ffprobe_path, video_path, ['-show_entries', 'format=duration']
+                )
+
+            if duration is None:
+                BilibiliParser._logger.warning(f"Failed to get duration: {video_path}")
             else:
-                BilibiliParser._logger.warning(f"ffprobe failed with code: {result.returncode}")
-                return None
+                BilibiliParser._logger.debug(f"Video duration: {duration}s")
+            return duration
         except Exception as e:
             BilibiliParser._logger.error(f"Error getting video duration: {e}")
             return None
 
+    @staticmethod
+    def _run_duration_probe(ffprobe_path: str, video_path: str, args: List[str]) -> Optional[float]:
+        """执行一次ffprobe，返回输出中第一个可解析的时长"""
+        cmd = [ffprobe_path, '-v', 'error', *args, '-of', 'default=noprint_wrappers=1:nokey=1', video_path]
+        BilibiliParser._logger.debug(f"Running ffprobe: {' '.join(cmd)}")
+
+        # 使用正确的编码设置来避免跨平台编码问题
+        result = subprocess.run(cmd, capture_output=True, text=False)
+
+        BilibiliParser._logger.debug(f"ffprobe return code: {result.returncode}")
+        stdout_text = result.stdout.decode('utf-8', errors='replace').strip() if result.stdout else ''
+        if stdout_text:
+            BilibiliParser._logger.debug(f"ffprobe output: {stdout_text}")
+        if result.stderr:
+            stderr_text = result.stderr.decode('utf-8', errors='replace').strip()
+            BilibiliParser._logger.debug(f"ffprobe stderr: {stderr_text}")
+
+        if result.returncode != 0:
+            BilibiliParser._logger.warning(f"ffprobe failed with code: {result.returncode}")
+            return None
+
+        # 缺失的字段输出为 "N/A"，跳过
+        for line in stdout_text.splitlines():
+            try:
+                return float(line)
+            except ValueError:
+                continue
+        return None
 
 class VideoCompressor:
     """视频压缩处理类 - 支持自动硬件加速"""
@@ -1003,7 +1325,8 @@ class VideoCompressor:
         if not self.ffmpeg_path:
             self._logger.warning("未找到ffmpeg，将使用系统默认路径")
             self.ffmpeg_path = 'ffmpeg'
-        
+        # 硬件解码失败（输入编码或位深不受支持）后改用软件解码
+        self.use_hwaccel = True
         
         # 读取配置
         self.config = config or {}
@@ -1097,6 +1420,13 @@ class VideoCompressor:
             # 执行压缩
             result = subprocess.run(cmd, capture_output=True, text=False, timeout=1800)  # 30分钟超时
             
+            if result.returncode != 0 and '-hwaccel' in cmd:
+                # 10位HEVC/AV1等输入的硬件解码帧可能不被编码器接受，改用软件解码重试一次
+                self._logger.warning("硬件解码压缩失败，改用软件解码重试")
+                self.use_hwaccel = False
+                cmd = self._build_compression_command(input_path, output_path, quality)
+                result = subprocess.run(cmd, capture_output=True, text=False, timeout=1800)
+            
             if result.returncode == 0:
                 # 检查压缩后的文件大小
                 if os.path.exists(output_path):
@@ -1137,8 +1467,13 @@ class VideoCompressor:
     def _build_compression_command(self, input_path: str, output_path: str, quality: int) -> List[str]:
         """构建基于硬件加速的压缩命令"""
         
-        # 基础命令
-        cmd = [self.ffmpeg_path, '-i', input_path]
+        # 基础命令：只输出错误信息，硬件编码时同时启用硬件解码
+        cmd = [self.ffmpeg_path, '-hide_banner', '-nostats', '-loglevel', 'error']
+        hwaccel_args = _ffmpeg_manager.get_hwaccel_args(self.recommended_encoder) if self.use_hwaccel else []
+        if hwaccel_args:
+            cmd.extend(hwaccel_args)
+            self._logger.debug(f"使用硬件解码: {' '.join(hwaccel_args)}")
+        cmd.extend(['-i', input_path, '-threads', '0'])
         
         # 根据编码器类型添加不同的参数
         if self.recommended_encoder == "libx264":
@@ -1219,6 +1554,10 @@ class VideoCompressor:
 
 
 
+# WBI 签名前需要从参数值中去除的字符
+_WBI_FILTER_RE = re.compile(r"[!'()*]")
+
+
 class BilibiliWbiSigner:
     """WBI 签名工具：自动获取 wbi key 并缓存，生成 w_rid/wts"""
     
@@ -1230,16 +1569,18 @@ class BilibiliWbiSigner:
         37, 48, 40, 17, 16, 7, 24, 55, 54, 4, 52, 30, 26, 22, 44, 0,
         1, 34, 25, 6, 51, 11, 36, 20, 21,
     ]
+    # mixin key 只取前 32 位，预先构建取字符的 itemgetter，由 C 实现一次取出
+    _mixin_key_getter = operator.itemgetter(*_mixin_key_indices[:32])
 
     _cached_mixin_key: Optional[str] = None
     _cached_at: float = 0.0
     _cache_ttl_seconds: int = 3600
 
     @classmethod
-    def _fetch_wbi_keys(cls) -> Tuple[str, str]:
+    async def _fetch_wbi_keys(cls) -> Tuple[str, str]:
         """从 nav 接口拉取 wbi img/sub key"""
         url = "https://api.bilibili.com/x/web-interface/nav"
-        data = BilibiliParser._fetch_json(url)
+        data = await BilibiliParser._fetch_json(url)
         wbi_img = (((data or {}).get("data") or {}).get("wbi_img")) or {}
         img_url = wbi_img.get("img_url", "")
         sub_url = wbi_img.get("sub_url", "")
@@ -1251,39 +1592,48 @@ class BilibiliWbiSigner:
         return img_key, sub_key
 
     @classmethod
-    def _gen_mixin_key(cls) -> str:
+    async def _gen_mixin_key(cls) -> str:
         now = time.time()
         if cls._cached_mixin_key and (now - cls._cached_at) < cls._cache_ttl_seconds:
             return cls._cached_mixin_key
-        img_key, sub_key = cls._fetch_wbi_keys()
+        img_key, sub_key = await cls._fetch_wbi_keys()
         raw = (img_key + sub_key)
-        mixed = ''.join(raw[i] for i in cls._mixin_key_indices)[:32]
+        mixed = ''.join(cls._mixin_key_getter(raw))
         cls._cached_mixin_key = mixed
         cls._cached_at = now
         return mixed
 
     @classmethod
-    def sign_params(cls, params: Dict[str, Any]) -> Dict[str, Any]:
-        """生成 wts 和 w_rid 并返回带签名的参数副本"""
-        mixin_key = cls._gen_mixin_key()
+    async def _sign(cls, params: Dict[str, Any]) -> Tuple[Dict[str, Any], str, str]:
+        """清洗参数并加入 wts，返回 (参数副本, 已排序的查询串, w_rid)"""
+        mixin_key = await cls._gen_mixin_key()
         # 复制并清洗参数
-        safe_params: Dict[str, Any] = {}
-        for k, v in params.items():
-            if isinstance(v, str):
-                v2 = re.sub(r"[!'()*]", "", v)
-            else:
-                v2 = v
-            safe_params[k] = v2
+        safe_params: Dict[str, Any] = {
+            k: _WBI_FILTER_RE.sub("", v) if isinstance(v, str) else v
+            for k, v in params.items()
+        }
         # 加入 wts
-        wts = int(time.time())
-        safe_params["wts"] = wts
+        safe_params["wts"] = int(time.time())
         # 排序并 urlencode
-        items = sorted(safe_params.items(), key=lambda x: x[0])
-        query = urllib.parse.urlencode(items, doseq=True)
-        w_rid = hashlib.md5((query + mixin_key).encode("utf-8")).hexdigest()
+        query = urllib.parse.urlencode(sorted(safe_params.items()), doseq=True)
+        h = hashlib.md5(query.encode("utf-8"))
+        h.update(mixin_key.encode("utf-8"))
+        w_rid = h.hexdigest()
+        return safe_params, query, w_rid
+
+    @classmethod
+    async def sign_params(cls, params: Dict[str, Any]) -> Dict[str, Any]:
+        """生成 wts 和 w_rid 并返回带签名的参数副本"""
+        safe_params, _, w_rid = await cls._sign(params)
         safe_params["w_rid"] = w_rid
         return safe_params
 
+    @classmethod
+    async def sign_query(cls, params: Dict[str, Any]) -> str:
+        """生成带签名的查询串，直接复用签名时的编码结果，无需再次 urlencode"""
+        _, query, w_rid = await cls._sign(params)
+        return f"{query}&w_rid={w_rid}"
+
 
 
 class BilibiliAutoSendHandler(BaseEventHandler):
@@ -1609,7 +1959,7 @@ class BilibiliAutoSendHandler(BaseEventHandler):
 
         raw: str = getattr(message, "raw_message", "") or ""
         
-        url = BilibiliParser.find_first_bilibili_url(raw)
+        url = await BilibiliParser.find_first_bilibili_url(raw)
         if not url:
             return self._make_return_value(True, True, None)
         
@@ -1652,7 +2002,10 @@ class BilibiliAutoSendHandler(BaseEventHandler):
 
 
         # 检查FFmpeg可用性
-        ffmpeg_info = _ffmpeg_manager.check_ffmpeg_availability()
+        # FFmpeg检测会启动子进程，放到线程池执行，避免阻塞事件循环
+        ffmpeg_info = await asyncio.get_running_loop().run_in_executor(
+            None, _ffmpeg_manager.check_ffmpeg_availability
+        )
         show_ffmpeg_warnings = self.get_config("ffmpeg.show_warnings", True)
 
         if not ffmpeg_info["ffmpeg_available"]:
@@ -1701,23 +2054,20 @@ class BilibiliAutoSendHandler(BaseEventHandler):
             for rec in validation_result["recommendations"]:
                 self._logger.debug(f"配置建议: {rec}")
 
-        loop = asyncio.get_running_loop()
-
-        def _blocking() -> Optional[Tuple[BilibiliVideoInfo, List[str], str]]:
-            info = BilibiliParser.get_view_info_by_url(url)
-            if not info:
+        async def _resolve() -> Optional[Tuple[BilibiliVideoInfo, List[str], str]]:
+            resolved = await BilibiliParser.get_view_and_play(url, config_opts)
+            if not resolved:
                 self._logger.error("Failed to parse video info", url=url)
                 return None
-                
+
+            info, urls, status = resolved
             self._logger.debug("Video info parsed", title=info.title, aid=info.aid, cid=info.cid)
-            
-            urls, status = BilibiliParser.get_play_urls(info.aid, info.cid, config_opts)
             self._logger.debug("Playback URLs fetched", status=status, url_count=len(urls), title=info.title)
                     
-            return info, urls, status
+            return resolved
 
         try:
-            result = await loop.run_in_executor(None, _blocking)
+            result = await _resolve()
         except Exception as exc:  # noqa: BLE001 - 简要兜底
             error_msg = f"解析失败：{exc}"
             self._logger.error(error_msg)
@@ -1744,10 +2094,132 @@ class BilibiliAutoSendHandler(BaseEventHandler):
 
         # 同时发送视频文件
         self._logger.debug("Starting video download...")
-        def _download_to_temp(urls: List[str]) -> Optional[str]:
+        def _merge_streams(temp_path: str, video_temp: str, audio_temp: Optional[str]) -> str:
+            """合并视频流和音频流，失败时返回视频流文件"""
+            # 尝试使用FFmpeg合并
+            try:
+                import subprocess
+                import shutil
+
+                # 使用跨平台FFmpeg管理器获取ffmpeg路径
+                ffmpeg_path = _ffmpeg_manager.get_ffmpeg_path()
+                if ffmpeg_path:
+                    self._logger.debug(f"Using FFmpeg: {ffmpeg_path}")
+                    # 首先检查视频文件格式
+                    self._logger.debug("Checking file format...")
+
+                    # 检查视频文件 - 使用跨平台ffprobe
+                    ffprobe_path = _ffmpeg_manager.get_ffprobe_path()
+                    if ffprobe_path:
+                        probe_cmd = [ffprobe_path, '-v', 'error', '-show_entries', 'format=format_name', '-of', 'default=noprint_wrappers=1:nokey=1', video_temp]
+                        try:
+                            video_format = subprocess.run(probe_cmd, capture_output=True, text=False).stdout.decode('utf-8', errors='replace').strip()
+                        except Exception as e:
+                            self._logger.warning(f"Unable to check video format: {str(e)}")
+                            video_format = "unknown"
+
+                        # 如果有音频文件，检查其编码，AAC 可直接封装进 mp4
+                        audio_codec = "none"
+                        if audio_temp and os.path.exists(audio_temp):
+                            probe_cmd = [ffprobe_path, '-v', 'error', '-select_streams', 'a:0', '-show_entries', 'stream=codec_name', '-of', 'default=noprint_wrappers=1:nokey=1', audio_temp]
+                            try:
+                                audio_codec = subprocess.run(probe_cmd, capture_output=True, text=False).stdout.decode('utf-8', errors='replace').strip()
+                            except Exception as e:
+                                self._logger.warning(f"Unable to check audio codec: {str(e)}")
+                    else:
+                        self._logger.warning(f"ffprobe not found, unable to check file format: {ffprobe_path}")
+                        video_format = "unknown"
+                        audio_codec = "none"
+
+                    # 根据文件格式决定处理方式
+                    if 'm4s' in video_format.lower() or video_temp.lower().endswith('.m4s'):
+                        # 对于m4s格式，需要添加特殊参数
+                        if audio_temp and os.path.exists(audio_temp) and audio_codec == "aac":
+                            # 音视频均可直接封装，只做流复制，不重新编码
+                            self._logger.debug("AAC audio detected, merging with stream copy")
+                            ffmpeg_cmd = [
+                                ffmpeg_path,
+                                '-i', video_temp,
+                                '-i', audio_temp,
+                                '-c', 'copy',
+                                '-movflags', '+faststart',
+                                '-y', temp_path
+                            ]
+                        elif audio_temp and os.path.exists(audio_temp):
+                            self._logger.debug(f"Audio codec {audio_codec} not copied, transcoding audio to AAC")
+                            ffmpeg_cmd = [
+                                ffmpeg_path, 
+                                '-i', video_temp, 
+                                '-i', audio_temp, 
+                                '-c:v', 'copy',  # 复制视频流，不重新编码
+                                '-c:a', 'aac',   # 将音频转换为aac格式以确保兼容性
+                                '-strict', 'experimental',
+                                '-b:a', '192k',  # 设置音频比特率
+                                '-y', temp_path
+                            ]
+                        else:
+                            # 如果没有音频文件，只处理视频
+                            ffmpeg_cmd = [
+                                ffmpeg_path, 
+                                '-i', video_temp, 
+                                '-c:v', 'copy',
+                                '-y', temp_path
+                            ]
+                    else:
+                        # 标准处理方式
+                        if audio_temp and os.path.exists(audio_temp):
+                            ffmpeg_cmd = [
+                                ffmpeg_path, 
+                                '-i', video_temp, 
+                                '-i', audio_temp, 
+                                '-c:v', 'copy', 
+                                '-c:a', 'copy', 
+                                '-y', temp_path
+                            ]
+                        else:
+                            # 如果没有音频文件，只处理视频
+                            ffmpeg_cmd = [
+                                ffmpeg_path, 
+                                '-i', video_temp, 
+                                '-c:v', 'copy',
+                                '-y', temp_path
+                            ]
+
+                    self._logger.debug("Starting to merge video and audio...")
+
+                    # 使用正确的编码设置来避免Windows上的编码问题
+                    result = subprocess.run(ffmpeg_cmd, capture_output=True, text=False)
+
+                    if result.returncode == 0:
+                        self._logger.debug("Video and audio merged successfully")
+                        # 删除临时文件
+                        try:
+                            if os.path.exists(video_temp):
+                                os.remove(video_temp)
+                            if audio_temp and os.path.exists(audio_temp):
+                                os.remove(audio_temp)
+                            self._logger.debug("Temporary files cleaned")
+                        except Exception as e:
+                            self._logger.warning(f"Failed to clean temp: {str(e)}")
+
+                        return temp_path
+                    else:
+                        stderr_text = result.stderr.decode('utf-8', errors='replace') if result.stderr else ''
+                        self._logger.warning(f"FFmpeg merge failed: {stderr_text}")
+                else:
+                    self._logger.warning("FFmpeg not found, cannot merge video and audio")
+                    self._logger.debug("Using video stream only")
+            except Exception as e:
+                self._logger.warning(f"Merge failed: {str(e)}")
+
+            # 如果所有方法都失败，返回视频流文件
+            self._logger.debug("Using video stream only")
+            return video_temp
+
+        async def _download_to_temp(urls: List[str]) -> Optional[str]:
             try:
                 
-                safe_title = re.sub(r"[\\/:*?\"<>|]+", "_", info.title).strip() or "bilibili_video"
+                safe_title = _UNSAFE_FILENAME_RE.sub("_", info.title).strip() or "bilibili_video"
                 tmp_dir = tempfile.gettempdir()
                 temp_path = os.path.join(tmp_dir, f"{safe_title}.mp4")
                 
@@ -1781,174 +2253,35 @@ class BilibiliAutoSendHandler(BaseEventHandler):
                 if len(urls) >= 2 and (".m4s" in urls[0].lower() or ".m4s" in urls[1].lower()):
                     self._logger.debug("DASH format detected", stream_count=len(urls), format="m4s")
                     
-                    # 下载视频流
                     video_temp = os.path.join(tmp_dir, f"{safe_title}_video.m4s")
-
-                    req = BilibiliParser._build_request(urls[0], headers)
-                    with urllib.request.urlopen(req, timeout=60) as resp:
-                        # 获取文件总大小（如果可用）
-                        total_size = resp.headers.get('content-length')
-                        total_size = int(total_size) if total_size else 0
-                        
-                        # 创建进度条
-                        progress_bar = ProgressBar(total_size, "Video stream downloading", 30)
-                        
-                        with open(video_temp, "wb") as f:
-                            downloaded = 0
-                            while True:
-                                chunk = resp.read(1024 * 256)
-                                if not chunk:
-                                    break
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                # 使用进度条显示进度
-                                progress_bar.update(downloaded)
-                        
-                        # 完成进度条显示
-                        progress_bar.finish()
-                        video_size_mb = os.path.getsize(video_temp) / (1024 * 1024)
-                        self._logger.debug("Video stream downloaded", size_mb=f"{video_size_mb:.2f}")
-                    
-                    # 下载音频流
                     audio_temp = os.path.join(tmp_dir, f"{safe_title}_audio.m4s")
-                    
-                    # 如果有音频URL，下载音频流
-                    if len(urls) >= 2:
-
-                        req = BilibiliParser._build_request(urls[1], headers)
-                        with urllib.request.urlopen(req, timeout=60) as resp:
-                            # 获取文件总大小（如果可用）
-                            total_size = resp.headers.get('content-length')
-                            total_size = int(total_size) if total_size else 0
-                            
-                            # 创建进度条
-                            progress_bar = ProgressBar(total_size, "Audio stream downloading", 30)
-                            
-                            with open(audio_temp, "wb") as f:
-                                downloaded = 0
-                                while True:
-                                    chunk = resp.read(1024 * 256)
-                                    if not chunk:
-                                        break
-                                    f.write(chunk)
-                                    downloaded += len(chunk)
-                                    # 使用进度条显示进度
-                                    progress_bar.update(downloaded)
-                            
-                            # 完成进度条显示
-                            progress_bar.finish()
-                            self._logger.debug(f"Audio stream downloaded, size: {os.path.getsize(audio_temp) // (1024 * 1024)}MB")
-                    else:
-                        self._logger.debug("No audio stream URL available")
-                        audio_temp = None
-                    
-                    # 尝试使用FFmpeg合并
+
+                    # 并发下载视频流和音频流
+                    downloads = [
+                        asyncio.ensure_future(BilibiliParser.download_stream(urls[0], video_temp, headers, "Video stream downloading")),
+                        asyncio.ensure_future(BilibiliParser.download_stream(urls[1], audio_temp, headers, "Audio stream downloading")),
+                    ]
                     try:
-                        import subprocess
-                        import shutil
-
-                        # 使用跨平台FFmpeg管理器获取ffmpeg路径
-                        ffmpeg_path = _ffmpeg_manager.get_ffmpeg_path()
-                        if ffmpeg_path:
-                            self._logger.debug(f"Using FFmpeg: {ffmpeg_path}")
-                            # 首先检查视频文件格式
-                            self._logger.debug("Checking file format...")
-                            
-                            # 检查视频文件 - 使用跨平台ffprobe
-                            ffprobe_path = _ffmpeg_manager.get_ffprobe_path()
-                            if ffprobe_path:
-                                probe_cmd = [ffprobe_path, '-v', 'error', '-show_entries', 'format=format_name', '-of', 'default=noprint_wrappers=1:nokey=1', video_temp]
-                                try:
-                                    video_format = subprocess.run(probe_cmd, capture_output=True, text=False).stdout.decode('utf-8', errors='replace').strip()
-                                except Exception as e:
-                                    self._logger.warning(f"Unable to check video format: {str(e)}")
-                                    video_format = "unknown"
-                                    
-                                # 如果有音频文件，检查其格式
-                                audio_format = "none"
-                                if audio_temp and os.path.exists(audio_temp):
-                                    probe_cmd = [ffprobe_path, '-v', 'error', '-show_entries', 'format=format_name', '-of', 'default=noprint_wrappers=1:nokey=1', audio_temp]
-                                    try:
-                                        audio_format = subprocess.run(probe_cmd, capture_output=True, text=False).stdout.decode('utf-8', errors='replace').strip()
-                                    except Exception as e:
-                                        self._logger.warning(f"Unable to check audio format: {str(e)}")
-                            else:
-                                self._logger.warning(f"ffprobe not found, unable to check file format: {ffprobe_path}")
-                                video_format = "unknown"
-                                audio_format = "none"
-                            
-                            # 根据文件格式决定处理方式
-                            if 'm4s' in video_format.lower() or video_temp.lower().endswith('.m4s'):
-                                # 对于m4s格式，需要添加特殊参数
-                                if audio_temp and os.path.exists(audio_temp):
-                                    ffmpeg_cmd = [
-                                        ffmpeg_path, 
-                                        '-i', video_temp, 
-                                        '-i', audio_temp, 
-                                        '-c:v', 'copy',  # 复制视频流，不重新编码
-                                        '-c:a', 'aac',   # 将音频转换为aac格式以确保兼容性
-                                        '-strict', 'experimental',
-                                        '-b:a', '192k',  # 设置音频比特率
-                                        '-y', temp_path
-                                    ]
-                                else:
-                                    # 如果没有音频文件，只处理视频
-                                    ffmpeg_cmd = [
-                                        ffmpeg_path, 
-                                        '-i', video_temp, 
-                                        '-c:v', 'copy',
-                                        '-y', temp_path
-                                    ]
-                            else:
-                                # 标准处理方式
-                                if audio_temp and os.path.exists(audio_temp):
-                                    ffmpeg_cmd = [
-                                        ffmpeg_path, 
-                                        '-i', video_temp, 
-                                        '-i', audio_temp, 
-                                        '-c:v', 'copy', 
-                                        '-c:a', 'copy', 
-                                        '-y', temp_path
-                                    ]
-                                else:
-                                    # 如果没有音频文件，只处理视频
-                                    ffmpeg_cmd = [
-                                        ffmpeg_path, 
-                                        '-i', video_temp, 
-                                        '-c:v', 'copy',
-                                        '-y', temp_path
-                                    ]
-                            
-                            self._logger.debug("Starting to merge video and audio...")
-                            
-                            # 使用正确的编码设置来避免Windows上的编码问题
-                            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=False)
-                            
-                            if result.returncode == 0:
-                                self._logger.debug("Video and audio merged successfully")
-                                # 删除临时文件
-                                try:
-                                    if os.path.exists(video_temp):
-                                        os.remove(video_temp)
-                                    if audio_temp and os.path.exists(audio_temp):
-                                        os.remove(audio_temp)
-                                    self._logger.debug("Temporary files cleaned")
-                                except Exception as e:
-                                    self._logger.warning(f"Failed to clean temp: {str(e)}")
-                                    
-                                return temp_path
-                            else:
-                                stderr_text = result.stderr.decode('utf-8', errors='replace') if result.stderr else ''
-                                self._logger.warning(f"FFmpeg merge failed: {stderr_text}")
-                        else:
-                            self._logger.warning("FFmpeg not found, cannot merge video and audio")
-                            self._logger.debug("Using video stream only")
-                    except Exception as e:
-                        self._logger.warning(f"Merge failed: {str(e)}")
-                    
-                    # 如果所有方法都失败，返回视频流文件
-                    self._logger.debug("Using video stream only")
-                    return video_temp
+                        await asyncio.gather(*downloads)
+                    except BaseException:
+                        # 任一路失败时取消另一路，并清理残留的临时文件
+                        for task in downloads:
+                            task.cancel()
+                        await asyncio.gather(*downloads, return_exceptions=True)
+                        for stream_temp in (video_temp, audio_temp):
+                            try:
+                                os.remove(stream_temp)
+                            except OSError:
+                                pass
+                        raise
+                    video_size_mb = os.path.getsize(video_temp) / (1024 * 1024)
+                    self._logger.debug("Video stream downloaded", size_mb=f"{video_size_mb:.2f}")
+                    self._logger.debug(f"Audio stream downloaded, size: {os.path.getsize(audio_temp) // (1024 * 1024)}MB")
+
+                    # FFmpeg合并是阻塞操作，放到线程池执行
+                    return await asyncio.get_running_loop().run_in_executor(
+                        None, lambda: _merge_streams(temp_path, video_temp, audio_temp)
+                    )
                 
                 # 非分离流：仅支持DASH，跳过单文件下载
                 self._logger.debug("Only DASH streams supported, skipping single file download")
@@ -1957,7 +2290,7 @@ class BilibiliAutoSendHandler(BaseEventHandler):
                 self._logger.error(f"Failed to download video: {e}")
                 return None
 
-        temp_path = await asyncio.get_running_loop().run_in_executor(None, lambda: _download_to_temp(urls))
+        temp_path = await _download_to_temp(urls)
         if not temp_path:
             self._logger.warning("Video download failed")
             return self._make_return_value(True, True, "视频下载失败")
@@ -1966,7 +2299,9 @@ class BilibiliAutoSendHandler(BaseEventHandler):
         caption = f"{info.title}"
 
         # 检查视频时长
-        video_duration = BilibiliParser.get_video_duration(temp_path)
+        video_duration = await asyncio.get_running_loop().run_in_executor(
+            None, BilibiliParser.get_video_duration, temp_path
+        )
         self._logger.debug(f"Detected video duration: {video_duration} seconds")
         
         # 检查视频时长限制
@@ -2012,7 +2347,7 @@ class BilibiliAutoSendHandler(BaseEventHandler):
             await self._send_text("🧠 Qwen-Thinking 正在深度分析视频画面...", stream_id)
             # 抽帧分析
             # 这里的 video_duration 变量在上方已经定义过，直接传进去
-            frames = await loop.run_in_executor(None, lambda: self._extract_frames(temp_path, duration=video_duration))
+            frames = await asyncio.get_running_loop().run_in_executor(None, lambda: self._extract_frames(temp_path, duration=video_duration))
             if frames:
                 summary = await self._analyze_with_qwen_thinking(frames, info.title)
                 await self._send_text(f"📖 **AI 深度视觉总结报告**：\n\n{summary}", stream_id)
@@ -2055,9 +2390,12 @@ class BilibiliAutoSendHandler(BaseEventHandler):
                     "encoder_priority": self.get_config("ffmpeg.encoder_priority", ["nvidia", "intel", "amd", "apple"])
                 }
             }
-            compressor = VideoCompressor(ffmpeg_info["ffmpeg_path"], config_dict)
-            
-            if compressor.compress_video(temp_path, compressed_path, max_video_size_mb, compression_quality):
+            # 编码器检测和压缩都会阻塞，在线程池中执行
+            def _compress() -> bool:
+                compressor = VideoCompressor(ffmpeg_info["ffmpeg_path"], config_dict)
+                return compressor.compress_video(temp_path, compressed_path, max_video_size_mb, compression_quality)
+
+            if await asyncio.get_running_loop().run_in_executor(None, _compress):
                 compressed_size_mb = os.path.getsize(compressed_path) / (1024 * 1024)
                 self._logger.debug(f"Single video compression successful: {video_size_mb:.2f}MB -> {compressed_size_mb:.2f}MB")
                 final_video_path = compressed_path
@@ -2132,6 +2470,18 @@ class BilibiliAutoSendHandler(BaseEventHandler):
         return self._make_return_value(True, True, "已发送视频（若宿主支持）")
 
 
+class BilibiliSessionCloseHandler(BaseEventHandler):
+    """麦麦关闭时释放共享的 HTTP 会话。"""
+
+    event_type = EventType.ON_STOP
+    handler_name = "bilibili_session_close_handler"
+    handler_description = "关闭B站解析器共享的HTTP会话"
+
+    async def execute(self, message: MaiMessages | None) -> Tuple[bool, bool, Optional[str], None, None]:
+        await BilibiliParser.close()
+        return True, True, None, None, None
+
+
 @register_plugin
 class BilibiliVideoSenderPlugin(BasePlugin):
     """B站视频解析与自动发送插件。"""
@@ -2181,6 +2531,7 @@ class BilibiliVideoSenderPlugin(BasePlugin):
     def get_plugin_components(self) -> List[Tuple[ComponentInfo, Type]]:
         return [
             (BilibiliAutoSendHandler.get_handler_info(), BilibiliAutoSendHandler),
+            (BilibiliSessionCloseHandler.get_handler_info(), BilibiliSessionCloseHandler),
         ]
 
 
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import os
+import re
+import sys
+import types
+import urllib.parse
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+# Ensure plugin root on path for importing plugin module
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+# Stub modules required by plugin.py
+def _stub(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules.setdefault(name, module)
+    return sys.modules[name]
+
+
+class _Base:  # pragma: no cover - minimal stub
+    pass
+
+
+def get_logger(name):  # pragma: no cover - simple logger stub
+    class Logger:
+        def debug(self, *args, **kwargs):
+            pass
+
+        def info(self, *args, **kwargs):
+            pass
+
+        def warning(self, *args, **kwargs):
+            pass
+
+        def error(self, *args, **kwargs):
+            pass
+
+    return Logger()
+
+
+_stub("src")
+_stub("src.common")
+_stub("src.common.logger", get_logger=get_logger)
+_stub("src.common.tcp_connector", close_session_on_loop=lambda session, loop: None)
+_stub("src.plugin_system")
+_stub(
+    "src.plugin_system.base",
+    BaseAction=_Base,
+    BaseCommand=_Base,
+    BaseEventHandler=_Base,
+    BasePlugin=_Base,
+    ComponentInfo=_Base,
+)
+_stub("src.plugin_system.base.config_types", ConfigField=lambda **kwargs: kwargs)
+_stub(
+    "src.plugin_system.base.component_types",
+    ActionActivationType=types.SimpleNamespace(),
+    EventType=types.SimpleNamespace(ON_MESSAGE="on_message", ON_STOP="on_stop"),
+    MaiMessages=_Base,
+)
+_stub("src.plugin_system.apis", send_api=None, llm_api=None)
+_stub("src.plugin_system.apis.plugin_register_api", register_plugin=lambda cls: cls)
+
+import plugin  # noqa: E402
+from plugin import BilibiliWbiSigner  # noqa: E402
+
+IMG_KEY = "7cd084941338484aae1ad9425b84077c"
+SUB_KEY = "4932caff0ff746eab6f01bf08b70ac45"
+WTS = 1702204169
+
+MIXIN_KEY_ENC_TAB = [
+    46, 47, 18, 2, 53, 8, 23, 32, 15, 50, 10, 31, 58, 3, 45, 35,
+    27, 43, 5, 49, 33, 9, 42, 19, 29, 28, 14, 39, 12, 38, 41, 13,
+    37, 48, 40, 17, 16, 7, 24, 55, 54, 4, 52, 30, 26, 22, 44, 0,
+    1, 34, 25, 6, 51, 11, 36, 20, 21,
+]
+
+
+def _reference_sign_params(params):
+    """改写前的 sign_params 实现，作为对照"""
+    raw = IMG_KEY + SUB_KEY
+    mixin_key = "".join(raw[i] for i in MIXIN_KEY_ENC_TAB)[:32]
+    safe_params = {}
+    for k, v in params.items():
+        safe_params[k] = re.sub(r"[!'()*]", "", v) if isinstance(v, str) else v
+    safe_params["wts"] = WTS
+    items = sorted(safe_params.items(), key=lambda x: x[0])
+    query = urllib.parse.urlencode(items, doseq=True)
+    safe_params["w_rid"] = hashlib.md5((query + mixin_key).encode("utf-8")).hexdigest()
+    return safe_params
+
+
+@pytest.fixture(autouse=True)
+def fixed_keys(monkeypatch):
+    async def fake_fetch_wbi_keys(cls):
+        return IMG_KEY, SUB_KEY
+
+    monkeypatch.setattr(BilibiliWbiSigner, "_fetch_wbi_keys", classmethod(fake_fetch_wbi_keys))
+    monkeypatch.setattr(BilibiliWbiSigner, "_cached_mixin_key", None)
+    monkeypatch.setattr(plugin.time, "time", lambda: WTS + 0.5)
+
+
+PARAMS_CASES = [
+    {"foo": "114", "bar": "514", "zab": 1919810},
+    {"bvid": "BV1xx411c7mD", "cid": 12345, "qn": 80, "fnval": 4048, "fourk": 1},
+    {"keyword": "中文 (测试)!*'", "page": 2},
+    {"b": "2", "a": "1", "c": "x y+z&w"},
+]
+
+
+@pytest.mark.parametrize("params", PARAMS_CASES)
+def test_sign_params_matches_reference(params):
+    signed = asyncio.run(BilibiliWbiSigner.sign_params(params))
+    assert signed == _reference_sign_params(params)
+
+
+@pytest.mark.parametrize("params", PARAMS_CASES)
+def test_sign_query_matches_reference(params):
+    query = asyncio.run(BilibiliWbiSigner.sign_query(params))
+    expected = _reference_sign_params(params)
+    # 参数顺序可以不同，但每个参数和 w_rid 必须与原实现一致
+    assert dict(urllib.parse.parse_qsl(query)) == {k: str(v) for k, v in expected.items()}
+    assert query.endswith(f"&w_rid={expected['w_rid']}")
+
+
+def test_mixin_key_matches_reference():
+    mixin_key = asyncio.run(BilibiliWbiSigner._gen_mixin_key())
+    raw = IMG_KEY + SUB_KEY
+    assert mixin_key == "".join(raw[i] for i in MIXIN_KEY_ENC_TAB)[:32]
+
+
+def test_sign_params_known_vector():
+    # 公开文档中的示例签名
+    signed = asyncio.run(BilibiliWbiSigner.sign_params({"foo": "114", "bar": "514", "zab": 1919810}))
+    assert signed["w_rid"] == "8f6f2b5b3d485fe1886cec6a0be8c5d4"
@@ -1,4 +1,7 @@
+import asyncio
 import ssl
+from typing import Optional
+
 import certifi
 import aiohttp
 
@@ -7,3 +10,15 @@ ssl_context = ssl.create_default_context(cafile=certifi.where())
 
 async def get_tcp_connector():
     return aiohttp.TCPConnector(ssl=ssl_context)
+
+
+def close_session_on_loop(
+    session: Optional[aiohttp.ClientSession], loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """在会话所属的事件循环上关闭会话；该循环已不再运行时直接丢弃，其连接已随循环失效"""
+    if session is None or session.closed:
+        return
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+    else:
+        session.detach()